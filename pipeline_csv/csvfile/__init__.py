@@ -1,9 +1,16 @@
 """Interfaces for csv file."""
 import os
 import csv
+from operator import attrgetter
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
 from .. import Error
 from .row import Row as BaseRow
 from .defect import Defect
+from .index import SortedIndex
+
+WRITE_BUFFER = 1024 * 1024
+NOT_FLOATS = frozenset([str, int, bool, type(None)])
 
 
 def transform_length(dist_od, length_od, table, table_index):
@@ -69,6 +76,14 @@ def transform_dist(dist_od, table, table_index):
     return table_index, pos
 
 
+def gap_length(item):
+    """Return gap length for join list item or None if item is not integer."""
+    try:
+        return int(item)
+    except (TypeError, ValueError):
+        return None
+
+
 class Stream:
     """Holds current state of data stream."""
 
@@ -97,7 +112,21 @@ def format_floats(val_list, float_delimiter):
     ]
 
 
-class File:
+def comma_floats(float_delimiter):
+    """Return function, that convert floats of csv values to string with given float delimiter.
+
+    Values without floats are returned as is.
+    """
+    def convert(values):
+        if NOT_FLOATS.issuperset(map(type, values)):
+            return values
+
+        return format_floats(values, float_delimiter)
+
+    return convert
+
+
+class File:  # pylint: disable=too-many-public-methods
     """Export/import csv file."""
 
     RowCls = BaseRow
@@ -144,6 +173,7 @@ class File:
         self.ids = set()
         self.initial_diameter = diameter
         self.stream = Stream(diameter=self.initial_diameter)
+        self.rows_index = None
 
         if self.stream.diameter:
             row = self.RowCls.as_diam(0, "", self.stream.diameter)
@@ -151,9 +181,9 @@ class File:
             self.diameters.append(row)
 
     @classmethod
-    def open_file(cls, file_path, mode):
+    def open_file(cls, file_path, mode, buffering=-1):
         """Open file wrapper."""
-        return open(file_path, mode + 't', encoding=cls.ENCODING)
+        return open(file_path, mode + 't', encoding=cls.ENCODING, buffering=buffering)
 
     @classmethod
     def at_folder(cls, folder, diameter):
@@ -161,17 +191,84 @@ class File:
         return cls.from_file(os.path.join(folder, cls.file_name), diameter)
 
     @classmethod
-    def from_file(cls, file_path, diameter=None, float_delimiter=FloatDelimiter.Point):
-        """Construct from export csv file."""
+    def read_rows(cls, file_path):
+        """Return iterator for rows of csv file in file order."""
+        with cls.open_file(file_path, 'r') as inp:
+            reader = csv.reader(inp, delimiter=cls.DELIMETER)
+            next(reader, None)  # skip column titles row
+            for row in reader:
+                if row:
+                    yield cls.RowCls.from_csv_row(row)
+
+    @classmethod
+    def iter_rows(cls, file_path):
+        """Return iterator for rows of csv file, that must be sorted by distance.
+
+        Rows are read from file one by one, so memory usage does not depend on file size.
+        """
+        last = None
+        for item in cls.read_rows(file_path):
+            dist = item.dist
+            if (last is not None) and (dist < last):
+                raise Error("Unsorted dist {} after {}".format(dist, last))
+            last = dist
+            yield item
+
+    @classmethod
+    def iter_tubes(cls, file_path, diameter=None, warns=None):
+        """Return iterator for tubes of csv file, that must be sorted by distance.
+
+        Unlike from_file/get_tubes, only rows of the current tube are hold in memory.
+        Row IDs are checked for unique inside tube (from previous weld).
+        """
+        obj = cls(diameter)
+        return obj.get_tubes(warns, rows=obj.tube_unique_rows(cls.iter_rows(file_path)))
+
+    @classmethod
+    def map_file(cls, file_path):
+        """Return memory mapped csv file, that must be sorted by distance.
+
+        Rows are parsed on demand for requested ranges of distances or tubes.
+        """
+        from .mapped import MappedFile
+
+        return MappedFile(file_path, cls)
+
+    def unique_rows(self, rows):
+        """Return iterator for given rows with check for row ID property is unique."""
+        for row in rows:
+            self.check_id_unique(row)
+            yield row
+
+    def tube_unique_rows(self, rows):
+        """Return iterator for rows, sorted by distance, with check for row ID property is unique from previous weld.
+
+        Only IDs of current tube rows are hold in memory.
+        """
+        for row in rows:
+            if row.is_weld:
+                self.ids.clear()
+            self.check_id_unique(row)
+            yield row
+
+    @classmethod
+    def from_file(cls, file_path, diameter=None, float_delimiter=FloatDelimiter.Point, cache=False):
+        """Construct from export csv file.
+
+        If cache is True, parsed rows are loaded from binary cache file near csv file (see cache.py).
+        Cache is created or updated if it is missing or csv file was changed.
+        """
         obj = cls(diameter, float_delimiter=float_delimiter)
-        reader = csv.reader(cls.open_file(file_path, 'r'), delimiter=cls.DELIMETER)
-        next(reader)  # skip column titles row
-        for row in reader:
+        rows = cls.read_rows(file_path)
+        key = cached = None
+        if cache:
+            from .cache import file_key, load_rows
 
-            if not row:
-                continue
+            key = file_key(file_path, cls.RowCls)
+            cached = load_rows(file_path, key)
+            rows = list(rows) if cached is None else cached
 
-            item = cls.RowCls.from_csv_row(row)
+        for item in rows:
             obj.check_id_unique(item)
             obj.data.append(item)
 
@@ -182,6 +279,11 @@ class File:
             elif item.is_diam:
                 obj.diameters.append(item)
 
+        if key and (cached is None):
+            from .cache import save_rows
+
+            save_rows(file_path, key, rows)
+
         return obj
 
     def check_id_unique(self, row):
@@ -191,51 +293,160 @@ class File:
                 raise Error("Duplicate object ID: '{}'".format(row.obj_id))
             self.ids.add(row.obj_id)
 
+    def sorted_index(self):
+        """Return cached index with rows, sorted by distance.
+
+        Index is rebuilt if data list was replaced or its size was changed.
+        Call invalidate after other inplace changes of data list or rows distances.
+        """
+        if (self.rows_index is None) or not self.rows_index.is_valid(self.data):
+            self.rows_index = SortedIndex(self.data)
+
+        return self.rows_index
+
+    def objects_between(self, start, end, kinds=None):
+        """Return list of rows with distance from start to end inclusive, sorted by distance.
+
+        If kinds is set, only rows with type_object from given list of ObjectClass values are returned.
+        """
+        return self.sorted_index().between(start, end, kinds)
+
+    def nearest(self, dist, kind):
+        """Return row with type_object kind, nearest to given dist, or None."""
+        return self.sorted_index().nearest(dist, kind)
+
+    def annotate_defects(self, defects):
+        """Set nearest upstream/downstream markers and valves for given defects of file tubes.
+
+        Distances are available as Defect.to_marker_up, to_marker_down, to_valve_up, to_valve_down.
+        """
+        self.sorted_index().reference_index().annotate(defects)
+
+    def tube_at(self, dist, warns=None):
+        """Return tube, that contain given dist, or None if dist is out of tubes between first and last welds.
+
+        Tube is made with own stream state, so it can be called while iterating get_tubes.
+        """
+        from .tubes import restore_stream
+
+        found = self.sorted_index().tube_rows(dist)
+        if found is None:
+            return None
+
+        number, stream_rows, rows = found
+        obj = self.__class__(self.initial_diameter)
+        tubes = obj.get_tubes(warns, rows=restore_stream(obj.stream, stream_rows, rows), auto_num=number)
+
+        return next(iter(tubes), None)
+
+    def sorted_data(self):
+        """Return list of rows, sorted by distance.
+
+        Rows are sorted on every call, so inplace changes of data list items and rows distances are taken into account.
+        Sort of already sorted rows takes linear time.
+        """
+        return sorted(self.data, key=attrgetter('dist'))
+
+    def invalidate(self):
+        """Drop cached index for rows."""
+        self.rows_index = None
+
     @property
     def total_length(self):
         """Reckord total length."""
-        return int(self.data[-1].dist_od)
+        return self.data[-1].dist
 
     def make_distances_unique(self, dist_shift_mm=1):
-        """Make distances of rows unique, by increasing values of duplicate distances."""
-        dist_list = []
+        """Make distances of rows unique, by increasing values of duplicate distances.
+
+        Return number of made shifts.
+        """
+        # used distance -> next candidate distance, all distances between them are used
+        used = {}
         shift_count = 0
         for row in self.data:
-            while row.dist_od in dist_list:
-                row.dist_od += dist_shift_mm
-                shift_count += 1
-            dist_list.append(row.dist_od)
+            dist = row.dist
+            new_dist = dist
+            path = []
+            while new_dist in used:
+                path.append(new_dist)
+                new_dist = used[new_dist]
+
+            for i in path:
+                used[i] = new_dist
+            used[new_dist] = new_dist + dist_shift_mm
+
+            if new_dist != dist:
+                shift_count += (new_dist - dist) // dist_shift_mm
+                row.dist_od = new_dist
+
+        if shift_count:
+            self.invalidate()
 
         return shift_count
 
-    def to_file(self, file_path):
-        """Save csv to file."""
+    def csv_values(self):
+        """Return iterator for column values of rows to save, with check for row ID property is unique.
+
+        Overridden check_id_unique and Row.values methods of dialects are called for every row.
+        """
         self.ids.clear()
-        output = self.open_file(file_path, 'w')
-        writer = csv.writer(output, delimiter=self.DELIMETER, lineterminator='\n')
+        ids = self.ids
+        check_id = None if type(self).check_id_unique is File.check_id_unique else self.check_id_unique
+
+        for row in self.sorted_data():
+            if row.type_object_num >= 0:
+                if check_id is not None:
+                    check_id(row)
+                elif row.obj_id:
+                    if row.obj_id in ids:
+                        raise Error("Duplicate object ID: '{}'".format(row.obj_id))
+                    ids.add(row.obj_id)
 
-        writer.writerow(self.COLUMN_HEADS)
-        for row in sorted(self.data, key=lambda val: int(val.dist_od)):
-            if int(row.type_object) >= 0:
-                self.check_id_unique(row)
-                writer.writerow(format_floats(row.values(), self.float_delimiter))
+                row_cls = row.__class__
+                yield row_cls.csv_values(row) if row_cls.values is BaseRow.values else row.values()
 
-        output.close()
+    def to_file(self, file_path):
+        """Save csv to file."""
+        rows = self.csv_values()
+        if self.float_delimiter != FloatDelimiter.Point:
+            rows = map(comma_floats(self.float_delimiter), rows)
+
+        with self.open_file(file_path, 'w', buffering=WRITE_BUFFER) as output:
+            writer = csv.writer(output, delimiter=self.DELIMETER, lineterminator='\n')
+            writer.writerow(self.COLUMN_HEADS)
+            writer.writerows(rows)
 
     def append(self, csv_file):
         """Append data from csv file."""
         length = self.total_length
         for item in csv_file.data:
-            item.dist_od = str(int(item.dist_od) + length)
-            self.data.append(item)
+            item.dist_od = str(item.dist + length)
+
+        self.data.extend(csv_file.data)
+        self.invalidate()
+
+    def join(self, files, workers=None):
+        """Join several csv files.
 
-    def join(self, files):
-        """Join several csv files."""
+        Items of files list are csv file names or integer lengths of gaps between files.
+        If workers is set, csv files are loaded in parallel by pool of given number of processes.
+        """
+        names = [item for item in files if gap_length(item) is None]
+        diameters = repeat(self.stream.diameter)
+
+        if workers:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                self.join_loaded(files, pool.map(self.from_file, names, diameters))
+        else:
+            self.join_loaded(files, map(self.from_file, names, diameters))
+
+    def join_loaded(self, files, loaded):
+        """Join csv files from loaded iterator, with gaps from files list."""
         for item in files:
-            try:
-                tube_length = int(item)
-            except ValueError:
-                self.append(self.from_file(item, self.stream.diameter))
+            tube_length = gap_length(item)
+            if tube_length is None:
+                self.append(next(loaded))
                 continue
 
             point = self.RowCls()
@@ -243,8 +454,11 @@ class File:
             point.type_object = -1  # set as ObjectClass.JOIN
             self.data.append(point)
 
+        self.invalidate()
+
     def reverse(self):
         """Reverse vector of objects."""
+        self.invalidate()
         total_length = self.total_length
         for i in self.data:
             i.reverse(total_length)
@@ -262,40 +476,51 @@ class File:
             return
 
         first_weld = self.data[index]
-        base_dist = int(first_weld.dist_od)
-        next_dist = int(self.data[index + 1].dist_od)
+        base_dist = first_weld.dist
+        next_dist = self.data[index + 1].dist
 
         # check for duplicate dist
         while (next_dist - base_dist) <= 1:
             index += 1
             base_dist = next_dist
-            next_dist = int(self.data[index + 1].dist_od)
+            next_dist = self.data[index + 1].dist
+
+        # copies of last thick/category/diameter objects are placed after first weld
+        # instead of its originals
+        inserts = []
+        removes = []
 
         if self.thicks:
             base_dist += 1
-            index += 1
             first_thick = self.thicks[-1].copy()
             first_thick.dist_od = str(base_dist)
-            self.data.insert(index, first_thick)
-            self.data.remove(self.thicks[-1])
+            inserts.append(first_thick)
+            removes.append(self.thicks[-1])
 
         if self.categories:
             base_dist += 1
-            index += 1
             first_category = self.categories[-1].copy()
             first_category.dist_od = str(base_dist)
-            self.data.insert(index, first_category)
-            self.data.remove(self.categories[-1])
+            inserts.append(first_category)
+            removes.append(self.categories[-1])
 
         if self.diameters:
             base_dist += 1
-            index += 1
             first = self.diameters[-1].copy()
             first.dist_od = str(base_dist)
             first.depth_min = ''
             first.depth_max = self.diameters[-1].depth_min
-            self.data.insert(index, first)
-            self.data.remove(self.diameters[0])
+            inserts.append(first)
+            removes.append(self.diameters[0])
+
+        if inserts:
+            index += 1
+            removes = set(id(i) for i in removes)
+            self.data[:] = [
+              i for i in self.data[:index] if id(i) not in removes
+            ] + inserts + [
+              i for i in self.data[index:] if id(i) not in removes
+            ]
 
     @classmethod
     def load_dist_modify(cls, file_name):
@@ -309,12 +534,27 @@ class File:
         table.sort(key=lambda val: val[0])
         return table
 
-    def dist_modify(self, table):
-        """Apply distance modificatons from file_name."""
+    def dist_modify(self, table, batch=False):
+        """Apply distance modificatons from file_name.
+
+        If batch is True, apply modifications to all rows at once by numpy package.
+        """
+        if len(table) < 2:
+            raise Error("Dist modifications table must have at least two nodes")
+
+        rows = self.sorted_data()
+        self.invalidate()
+
+        if batch:
+            from .columns import dist_modify
+
+            dist_modify(rows, table)
+            return
+
         table_index = 0
-        for row in sorted(self.data, key=lambda val: int(val.dist_od)):
+        for row in rows:
 
-            if int(row.dist_od) < table[table_index][0]:
+            if row.dist < table[table_index][0]:
                 raise Error("dist {} < node {}".format(row.dist_od, table[table_index][0]))
 
             if row.is_defect:
@@ -323,16 +563,24 @@ class File:
 
             table_index, row.dist_od = transform_dist(row.dist_od, table, table_index)
 
-    def _create_tubes_iterator(self, warns):
-        """Create iterator for tubes in csv data."""
+    def to_columns(self):
+        """Return columnar representation (NumPy arrays) for rows, sorted by distance.
+
+        Require numpy package.
+        """
+        from .columns import ColumnTable
+
+        return ColumnTable(self.sorted_data())
+
+    def _create_tubes_iterator(self, warns, rows, auto_num):
+        """Create iterator for tubes from rows sorted by distance, auto_num is number of first tube."""
         from .tubes import Tube
 
         tube = None
-        auto_num = 1
-        for row in sorted(self.data, key=lambda val: int(val.dist_od)):
+        for row in rows:
             if row.is_weld:
                 if tube:
-                    tube.finalize(row.dist_od)
+                    tube.finalize(row.dist)
                     auto_num += 1
                 yield tube
                 tube = Tube(row, self.stream, str(auto_num))
@@ -364,13 +612,19 @@ class File:
             warns.append(msg)
         return warns
 
-    def get_tubes(self, warns=None):
-        """Return ready iterator for tubes in csv data."""
+    def get_tubes(self, warns=None, rows=None, auto_num=1):
+        """Return ready iterator for tubes in csv data or in given rows, sorted by distance.
+
+        Tubes are numbered from auto_num.
+        """
         self.stream.diameter = self.initial_diameter
         self.stream.thick = None
         self.stream.category = None
 
-        tubes = self._create_tubes_iterator(warns)
+        if rows is None:
+            rows = self.sorted_data()
+
+        tubes = self._create_tubes_iterator(warns, rows, auto_num)
         try:
             next(tubes)
         except StopIteration:
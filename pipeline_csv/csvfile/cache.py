@@ -0,0 +1,89 @@
+"""Binary cache for parsed rows of csv file.
+
+Cache file is placed near csv file and is valid while size, modification time
+and content hash of csv file and row class are the same, as at cache creation.
+Cache is loaded by pickle, so it must be placed only in trusted folders.
+"""
+import gc
+import os
+import pickle
+import hashlib
+import tempfile
+from contextlib import suppress
+
+from .row import state_fields
+
+VERSION = 2
+SUFFIX = '.cache'
+CHUNK = 1024 * 1024
+LOAD_ERRORS = (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, TypeError, ValueError)
+
+
+def cache_path(file_path):
+    """Return name of cache file for given csv file."""
+    return file_path + SUFFIX
+
+
+def file_key(file_path, row_cls):
+    """Return key of cache for given csv file and row class."""
+    stat = os.stat(file_path)
+    sha1 = hashlib.sha1()
+    with open(file_path, 'rb') as inp:
+        for chunk in iter(lambda: inp.read(CHUNK), b''):
+            sha1.update(chunk)
+
+    return (
+      VERSION,
+      row_cls.__module__,
+      row_cls.__qualname__,
+      state_fields(row_cls),
+      stat.st_size,
+      stat.st_mtime_ns,
+      sha1.hexdigest(),
+    )
+
+
+def load_rows(file_path, key):
+    """Return list of rows from cache of csv file or None if cache is missing or has other key."""
+    # garbage collector passes on many new rows only slow down unpickling
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with open(cache_path(file_path), 'rb') as inp:
+            if pickle.load(inp) == key:
+                return pickle.load(inp)
+    except LOAD_ERRORS:
+        pass
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    return None
+
+
+def save_rows(file_path, key, rows):
+    """Save list of rows, parsed from csv file, to cache with given key. Return True on success.
+
+    Cache is written to unique temporary file in the same folder, that replaces cache file at once,
+    so concurrent saves of the same csv file cache do not mix data.
+    """
+    name = cache_path(file_path)
+    try:
+        handle, temp = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(name) or None)
+    except OSError:
+        return False
+
+    try:
+        with os.fdopen(handle, 'wb') as out:
+            pickle.dump(key, out, pickle.HIGHEST_PROTOCOL)
+            pickle.dump(rows, out, pickle.HIGHEST_PROTOCOL)
+        os.replace(temp, name)
+        temp = None
+    except OSError:
+        return False
+    finally:
+        if temp is not None:
+            with suppress(OSError):
+                os.remove(temp)
+
+    return True
@@ -0,0 +1,181 @@
+"""Columnar (NumPy arrays) representation of csv file data.
+
+Requires optional numpy package.
+"""
+import numpy as np
+
+from .. import Error, ObjectClass
+
+NO_ORIENT = -1
+
+
+def int_column(values):
+    """Return array of integers for given values."""
+    return np.fromiter(values, dtype=np.int64)
+
+
+def float_column(values):
+    """Return array of floats for given values, None values became NaN."""
+    return np.array(list(values), dtype=np.float64)
+
+
+def orient_column(rows, field):
+    """Return array of orientation minutes for given text field of rows, NO_ORIENT for empty values."""
+    get_minutes = rows[0].get_minutes if rows else None
+    result = np.full(len(rows), NO_ORIENT, dtype=np.int64)
+    for i, row in enumerate(rows):
+        minutes = get_minutes(getattr(row, field))
+        if minutes is not None:
+            result[i] = minutes
+
+    return result
+
+
+class ColumnTable:  # pylint: disable=too-many-instance-attributes
+    """Csv rows, sorted by distance, as NumPy arrays for columns.
+
+    Empty numeric fields are NaN in float columns and NO_ORIENT in orientation columns.
+    Boolean mask properties (is_weld, is_defect, ...) can be combined with & | ~
+    and used for indexing of columns or for select method.
+    """
+
+    def __init__(self, rows):
+        """Make columns from rows, sorted by distance."""
+        self.rows = rows
+        self.dist_od = int_column(row.dist for row in rows)
+        self.type_object = int_column(row.type_object_num for row in rows)
+        self.object_code = float_column(row.object_code_num for row in rows)
+        self.length = float_column(row.length_num for row in rows)
+        self.width = float_column(row.width_num for row in rows)
+        self.depth_min = float_column(row.depth_min_num for row in rows)
+        self.depth_max = float_column(row.depth_max_num for row in rows)
+        self.mpoint_dist = float_column(row.mpoint_dist_num for row in rows)
+        self.type_def = float_column(row.type_def_num for row in rows)
+        self.marker = np.fromiter((bool(row.is_marker_int) for row in rows), dtype=bool, count=len(rows))
+        self.orient_td = orient_column(rows, 'orient_td')
+        self.orient_bd = orient_column(rows, 'orient_bd')
+        self.mpoint_orient = orient_column(rows, 'mpoint_orient')
+
+    def __len__(self):
+        """Return number of rows."""
+        return len(self.rows)
+
+    def select(self, mask):
+        """Return list of rows for given boolean mask or array of indexes."""
+        return [self.rows[i] for i in np.arange(len(self.rows))[mask]]
+
+    def between(self, start, end):
+        """Return mask for objects with distance from start to end inclusive."""
+        return (self.dist_od >= start) & (self.dist_od <= end)
+
+    def with_codes(self, codes):
+        """Return mask for objects with object_code in given list."""
+        return np.isin(self.object_code, list(codes))
+
+    @property
+    def is_category(self):
+        """Mask for pipeline category objects."""
+        return self.type_object == ObjectClass.PIPELINE_CATEGORY
+
+    @property
+    def is_thick(self):
+        """Mask for wall thick change objects."""
+        return self.type_object == ObjectClass.THICK
+
+    @property
+    def is_diam(self):
+        """Mask for diameter change objects."""
+        return self.type_object == ObjectClass.DIAM
+
+    @property
+    def is_weld(self):
+        """Mask for weld objects."""
+        return self.type_object == ObjectClass.WELD
+
+    @property
+    def is_defect(self):
+        """Mask for defect objects."""
+        return self.type_object == ObjectClass.DEFEKT
+
+    @property
+    def is_lineobj(self):
+        """Mask for line objects."""
+        return self.type_object == ObjectClass.MARKER
+
+    @property
+    def is_seam(self):
+        """Mask for seam objects."""
+        return self.type_object == ObjectClass.HOR_WELD
+
+    @property
+    def is_marker(self):
+        """Mask for line objects with marker feature."""
+        return self.is_lineobj & self.marker
+
+    @property
+    def is_valve(self):
+        """Mask for valve like objects."""
+        if not self.rows:
+            return self.is_lineobj
+
+        return self.is_lineobj & self.with_codes(self.rows[0].valve_codes())
+
+
+def transform_dists(dists, table):
+    """Return array of distances, transformed by table of dist modifications.
+
+    Result is the same as for transform_dist calls with ascending distances.
+    Table must have at least two nodes.
+    """
+    if len(table) < 2:
+        raise Error("Dist modifications table must have at least two nodes")
+
+    dists = np.asarray(dists, dtype=np.int64)
+    nodes = np.asarray(table, dtype=np.int64)
+    old, new = nodes[:, 0], nodes[:, 1]
+
+    index = np.minimum(np.searchsorted(old[1:], dists, side='left'), len(old) - 2)
+    left_old, left_new = old[index], new[index]
+    right_old, right_new = old[index + 1], new[index + 1]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inside = np.rint(
+          ((dists - left_old).astype(np.float64) * (right_new - left_new)) / (right_old - left_old) + left_new
+        )
+
+    return np.select(
+      [dists < left_old, dists == left_old, dists < right_old, dists == right_old],
+      [left_new - (left_old - dists), left_new, inside, right_new],
+      default=right_new + (dists - right_old)
+    ).astype(np.int64)
+
+
+def dist_modify(rows, table):
+    """Apply distance modificatons from table to rows, sorted by distance, at once."""
+    if not rows:
+        return
+
+    if rows[0].dist < table[0][0]:
+        raise Error("dist {} < node {}".format(rows[0].dist_od, table[0][0]))
+
+    table = np.asarray(table, dtype=np.int64)
+    dists = int_column(row.dist for row in rows)
+    new_dists = transform_dists(dists, table).tolist()
+
+    defects = [(i, row) for i, row in enumerate(rows) if row.is_defect]
+    mpoints = [(row, row.mpoint_dist_num) for _, row in defects if row.mpoint_dist_num is not None]
+    lengths = [(row, dists[i], row.length_num) for i, row in defects if row.length_num]
+
+    if mpoints:
+        values = transform_dists([i[1] for i in mpoints], table).tolist()
+        for (row, _), value in zip(mpoints, values):
+            row.mpoint_dist = value
+
+    if lengths:
+        starts = transform_dists([i[1] for i in lengths], table)
+        ends = transform_dists([i[1] + i[2] for i in lengths], table)
+        for (row, _, _), value in zip(lengths, (ends - starts).tolist()):
+            row.length = value
+
+    for row, value in zip(rows, new_dists):
+        row.dist_od = value
@@ -1,6 +1,14 @@
 """Row with type Defect."""
-from pipeline_csv.orientation import Orientation
-from .row import Depth
+from pipeline_csv.orientation import Orientation, CIRCLE_MINUTES
+from .row import Depth, Category
+
+
+def parse_orient(cached, text):
+    """Return (text, orientation) pair for text of row orientation field, reuse cached pair for the same text."""
+    if (cached is not None) and (cached[0] == text):
+        return cached
+
+    return (text, Orientation.from_csv(text) if text else None)
 
 
 class Anomaly:
@@ -11,13 +19,31 @@ class Anomaly:
         self.row = row
         self.pipe = pipe
 
-        self.orient1 = None
-        if self.row.orient_td:
-            self.orient1 = Orientation.from_csv(self.row.orient_td)
+        # (row text, orientation) pairs, orientations are parsed on first access
+        self._orient1 = None
+        self._orient2 = None
+
+    @property
+    def orient1(self):
+        """Return orientation of upstream defect border as Orientation or None."""
+        self._orient1 = parse_orient(self._orient1, self.row.orient_td)
+        return self._orient1[1]
+
+    @orient1.setter
+    def orient1(self, value):
+        """Set orientation of upstream defect border, row data is not changed."""
+        self._orient1 = (self.row.orient_td, value)
 
-        self.orient2 = None
-        if self.row.orient_bd:
-            self.orient2 = Orientation.from_csv(self.row.orient_bd)
+    @property
+    def orient2(self):
+        """Return orientation of downstream defect border as Orientation or None."""
+        self._orient2 = parse_orient(self._orient2, self.row.orient_bd)
+        return self._orient2[1]
+
+    @orient2.setter
+    def orient2(self, value):
+        """Set orientation of downstream defect border, row data is not changed."""
+        self._orient2 = (self.row.orient_bd, value)
 
     def __str__(self):
         """As text."""
@@ -26,9 +52,7 @@ class Anomaly:
     @property
     def length(self):
         """Return object length as integer."""
-        if self.row.length:
-            return int(self.row.length)
-        return 0
+        return self.row.num('length') or 0
 
     @length.setter
     def length(self, value):
@@ -38,9 +62,7 @@ class Anomaly:
     @property
     def width(self):
         """Return object width as integer mm."""
-        if self.row.width:
-            return int(self.row.width)
-        return 0
+        return self.row.num('width') or 0
 
     @width.setter
     def width(self, value):
@@ -50,7 +72,7 @@ class Anomaly:
     @property
     def code(self):
         """Return object code as integer."""
-        return int(self.row.object_code)
+        return self.row.num('object_code')
 
     @property
     def to_left_weld(self):
@@ -69,10 +91,55 @@ class Defect(Anomaly):
     def __init__(self, row, pipe):
         """Create defect at the pipe from csv Row."""
         super().__init__(row, pipe)
+        self._orient_mp = None
+        # Category bit flags for defect code at construction time
+        self.categories = row.code_categories().get(row.object_code_num, 0)
+        # position at pipe.defects list
+        self.position = None
+
+        # nearest reference rows, set by File.annotate_defects
+        self.marker_up = None
+        self.marker_down = None
+        self.valve_up = None
+        self.valve_down = None
 
-        self.orient_mp = None
-        if self.row.mpoint_orient:
-            self.orient_mp = Orientation.from_csv(self.row.mpoint_orient)
+    @property
+    def orient_mp(self):
+        """Return orientation of maximum depth point as Orientation or None."""
+        self._orient_mp = parse_orient(self._orient_mp, self.row.mpoint_orient)
+        return self._orient_mp[1]
+
+    @orient_mp.setter
+    def orient_mp(self, value):
+        """Set orientation of maximum depth point, row data is not changed."""
+        self._orient_mp = (self.row.mpoint_orient, value)
+
+    def _to_reference(self, reference):
+        """Return distance (mm) from defect to given reference row or None if reference is None."""
+        if reference is None:
+            return None
+
+        return abs(reference.dist - self.row.dist)
+
+    @property
+    def to_marker_up(self):
+        """Return distance (mm) from defect to nearest upstream marker."""
+        return self._to_reference(self.marker_up)
+
+    @property
+    def to_marker_down(self):
+        """Return distance (mm) from defect to nearest downstream marker."""
+        return self._to_reference(self.marker_down)
+
+    @property
+    def to_valve_up(self):
+        """Return distance (mm) from defect to nearest upstream valve."""
+        return self._to_reference(self.valve_up)
+
+    @property
+    def to_valve_down(self):
+        """Return distance (mm) from defect to nearest downstream valve."""
+        return self._to_reference(self.valve_down)
 
     @property
     def depth_percent(self):
@@ -80,14 +147,15 @@ class Defect(Anomaly):
         if not self.row.depth_max:
             return None
 
+        depth = self.row.num('depth_max')
         if self.row.depth_units == Depth.PercentWallThickness:
-            return float(self.row.depth_max)
+            return depth
 
         # Depth.HundredthsOfMillimeter
         if self.is_dent:
-            return float(self.row.depth_max) / self.pipe.diameter
+            return depth / self.pipe.diameter
 
-        return float(self.row.depth_max) / (self.pipe.thick / 10.0)
+        return depth / (self.pipe.thick / 10.0)
 
     @property
     def depth_mm(self):
@@ -95,14 +163,15 @@ class Defect(Anomaly):
         if not self.row.depth_max:
             return None
 
+        depth = self.row.num('depth_max')
         if self.row.depth_units == Depth.HundredthsOfMillimeter:
-            return float(self.row.depth_max) / 100.0
+            return depth / 100.0
 
         # Depth.PercentWallThickness
         if self.is_dent:
-            return self.pipe.diameter * float(self.row.depth_max) / 100.0
+            return self.pipe.diameter * depth / 100.0
 
-        return (self.pipe.thick / 10.0) * float(self.row.depth_max) / 100.0
+        return (self.pipe.thick / 10.0) * depth / 100.0
 
     @depth_mm.setter
     def depth_mm(self, value):
@@ -116,30 +185,45 @@ class Defect(Anomaly):
 
             self.row.depth_max = 100.0 * value / divider
 
+    def _is_positioned(self):
+        """Return True if defect position points to this defect at pipe.defects list."""
+        position = self.position
+        defects = self.pipe.defects
+        return (position is not None) and (position < len(defects)) and (defects[position] is self)
+
     @property
     def number_at_pipe(self):
-        """Return object number at pipe as integer."""
-        return self.pipe.defects.index(self) + 1
+        """Return object number at pipe as integer.
+
+        Position at pipe.defects list is set by Tube.add_object and checked on every call.
+        All positions are updated if defects list was changed.
+        """
+        if not self._is_positioned():
+            self.pipe.number_defects()
+            if not self._is_positioned():
+                return self.pipe.defects.index(self) + 1  # raise ValueError for defect, missed at the pipe
+
+        return self.position + 1
 
     @property
     def is_metal_loss(self):
         """Return True if metal loss defect."""
-        return self.code in self.row.mloss_codes()
+        return bool(self.categories & Category.METAL_LOSS)
 
     @property
     def is_dent(self):
         """Return True if dent defect."""
-        return self.code in self.row.dents_codes()
+        return bool(self.categories & Category.DENT)
 
     @property
     def is_at_weld(self):
         """Return True if weld placed defect."""
-        return self.code in self.row.atweld_codes()
+        return bool(self.categories & Category.AT_WELD)
 
     @property
     def is_at_seam(self):
         """Return True if seam placed defect."""
-        return self.code in self.row.atseam_codes()
+        return bool(self.categories & Category.AT_SEAM)
 
     def _with_mp(prop):  # pylint: disable=no-self-argument
         """Return decorator for property.
@@ -148,7 +232,7 @@ class Defect(Anomaly):
         """
         def wrapper(self):
             """Return None if defect does not have maximum depth point, or defect is located on a seam/weld."""
-            if self.is_at_weld or self.is_at_seam or (not self.row.mpoint_dist):
+            if (self.categories & (Category.AT_WELD | Category.AT_SEAM)) or (not self.row.mpoint_dist):
                 return None
             return prop(self)  # pylint: disable=not-callable
 
@@ -158,13 +242,13 @@ class Defect(Anomaly):
     @_with_mp
     def mp_left_weld(self):
         """Return distance (mm) from maximum depth point to upstream weld."""
-        return int(self.row.mpoint_dist) - self.pipe.dist
+        return self.row.num('mpoint_dist') - self.pipe.dist
 
     @property
     @_with_mp
     def mp_right_weld(self):
         """Return distance (mm) from maximum depth point to downstream weld."""
-        return self.pipe.dist + self.pipe.length - int(self.row.mpoint_dist)
+        return self.pipe.dist + self.pipe.length - self.row.num('mpoint_dist')
 
     @property
     @_with_mp
@@ -173,7 +257,7 @@ class Defect(Anomaly):
         if not self.pipe.to_seam_data:
             return None
 
-        mpoint = Orientation.from_csv(self.row.mpoint_orient)
+        mpoint = self.orient_mp
         dist = mpoint.dist_to(self.pipe.seam1)
         if self.pipe.seam2:
             dist = min(dist, mpoint.dist_to(self.pipe.seam2))
@@ -240,7 +324,7 @@ class Defect(Anomaly):
         None if no maximum depth point and both orient1 and orient2 is None
         """
         if self.row.mpoint_orient:
-            return Orientation.from_csv(self.row.mpoint_orient)
+            return self.orient_mp
 
         ornts = [i for i in [self.orient1, self.orient2] if i is not None]
 
@@ -248,8 +332,6 @@ class Defect(Anomaly):
             return ornts[0]
         if len(ornts) == 2:
             clockwise, _ = self.orient1.dist_to_int(self.orient2)
-            ornt = Orientation.from_minutes(self.orient1.as_minutes)
-            ornt.add_minutes(int(clockwise / 2))
-            return ornt
+            return Orientation.from_minutes((self.orient1.as_minutes + int(clockwise / 2)) % CIRCLE_MINUTES)
 
         return None
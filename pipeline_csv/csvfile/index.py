@@ -0,0 +1,145 @@
+"""Cached indexes for csv file rows."""
+from operator import attrgetter
+from bisect import bisect_left, bisect_right
+
+from .. import ObjectClass
+
+STREAM_OBJECTS = (ObjectClass.PIPELINE_CATEGORY, ObjectClass.DIAM, ObjectClass.THICK)
+
+
+def stream_positions(positions, size, position):
+    """Return positions of last category, diameter and thick rows between first weld and given position.
+
+    Positions is dict of sorted row positions by object type, size is number of rows.
+    Rows before first weld are ignored, as by File.get_tubes.
+    """
+    welds = positions.get(ObjectClass.WELD)
+    first = welds[0] if welds else size
+    result = []
+    for kind in STREAM_OBJECTS:
+        kind_positions = positions.get(kind, [])
+        index = bisect_left(kind_positions, position)
+        if index and (kind_positions[index - 1] > first):
+            result.append(kind_positions[index - 1])
+
+    return result
+
+
+class SortedIndex:
+    """Rows of csv file, sorted by distance, with positions of welds in sorted rows.
+
+    Positions and distances of rows are grouped also by object type (type_object_num)
+    for queries by distance with binary search.
+    """
+
+    def __init__(self, data):
+        """Make index for given list of rows."""
+        self.source = data
+        self.size = len(data)
+        self.rows = sorted(data, key=attrgetter('dist'))
+        self.dists = [row.dist for row in self.rows]
+        self.positions = {}
+        self.kind_dists = {}
+
+        for i, row in enumerate(self.rows):
+            kind = row.type_object_num
+            if kind not in self.positions:
+                self.positions[kind] = []
+                self.kind_dists[kind] = []
+            self.positions[kind].append(i)
+            self.kind_dists[kind].append(self.dists[i])
+
+        self.welds = self.positions.get(ObjectClass.WELD, [])
+        self.references = None
+
+    def is_valid(self, data):
+        """Return True if index was built for given list of rows and list size was not changed."""
+        return (data is self.source) and (len(data) == self.size)
+
+    def between(self, start, end, kinds=None):
+        """Return list of rows with distance from start to end inclusive and object type from kinds list."""
+        if kinds is None:
+            return self.rows[bisect_left(self.dists, start):bisect_right(self.dists, end)]
+
+        positions = []
+        for kind in kinds:
+            if kind not in self.positions:
+                continue
+            dists = self.kind_dists[kind]
+            positions.extend(self.positions[kind][bisect_left(dists, start):bisect_right(dists, end)])
+
+        return [self.rows[i] for i in sorted(positions)]
+
+    def reference_index(self):
+        """Return cached index of markers and valves."""
+        if self.references is None:
+            self.references = ReferenceIndex([self.rows[i] for i in self.positions.get(ObjectClass.MARKER, [])])
+
+        return self.references
+
+    def nearest(self, dist, kind):
+        """Return row of given object type, nearest to dist, or None. Upstream row wins on equal distances."""
+        dists = self.kind_dists.get(kind)
+        if not dists:
+            return None
+
+        index = bisect_left(dists, dist)
+        if (index == len(dists)) or (index and (dist - dists[index - 1] <= dists[index] - dist)):
+            index -= 1
+
+        return self.rows[self.positions[kind][index]]
+
+    def stream_rows(self, position):
+        """Return list of last category, diameter and thick rows between first weld and given position."""
+        return [self.rows[i] for i in stream_positions(self.positions, len(self.rows), position)]
+
+    def tube_rows(self, dist):
+        """Return (number, stream rows, tube rows) for tube, that contain dist, or None.
+
+        Tube rows include next weld. Tube number is counted from 1.
+        """
+        index = bisect_right(self.dists, dist)
+        number = bisect_left(self.welds, index)
+        if (not number) or (number >= len(self.welds)):
+            return None
+
+        first, stop = self.welds[number - 1], self.welds[number] + 1
+        return number, self.stream_rows(first), self.rows[first:stop]
+
+
+def nearest_references(references, defects):
+    """Return iterator for (defect, upstream reference, downstream reference) by one merge pass.
+
+    Both lists must be sorted by distance. Upstream reference has distance not greater than defect distance,
+    downstream reference has distance greater than defect distance. Missed reference is None.
+    """
+    index = 0
+    for defect in defects:
+        dist = defect.row.dist
+        while (index < len(references)) and (references[index].dist <= dist):
+            index += 1
+
+        yield (
+          defect,
+          references[index - 1] if index else None,
+          references[index] if index < len(references) else None,
+        )
+
+
+class ReferenceIndex:
+    """Reference objects (markers and valves) of csv file, sorted by distance."""
+
+    def __init__(self, rows):
+        """Make index from line objects, sorted by distance."""
+        self.markers = [row for row in rows if row.is_marker]
+        self.valves = [row for row in rows if row.is_valve]
+
+    def annotate(self, defects):
+        """Set nearest upstream and downstream markers and valves for given defects."""
+        defects = sorted(defects, key=lambda defect: defect.row.dist)
+
+        for defect, upstream, downstream in nearest_references(self.markers, defects):
+            defect.marker_up, defect.marker_down = upstream, downstream
+
+        for defect, upstream, downstream in nearest_references(self.valves, defects):
+            defect.valve_up, defect.valve_down = upstream, downstream
@@ -0,0 +1,147 @@
+"""Csv file, sorted by distance, mapped to memory.
+
+Only line offsets, distances and object types are indexed on open,
+rows are parsed on demand for requested ranges.
+"""
+import io
+import csv
+import mmap
+from array import array
+from bisect import bisect_left, bisect_right
+
+from .. import Error, ObjectClass
+from .index import STREAM_OBJECTS, stream_positions
+from .tubes import restore_stream
+
+QUOTE = b'"'
+NEWLINE = b'\n'
+
+
+class MappedFile:
+    """Index over memory mapped csv file, that must be sorted by distance.
+
+    Rows are numbered from 0 in file order without column titles row.
+    """
+
+    def __init__(self, file_path, file_cls):
+        """Map given csv file to memory and index it, file_cls is File class for csv dialect."""
+        self.file_cls = file_cls
+        self.offsets = array('q')
+        self.dists = array('q')
+        self.types = array('q')
+        self.positions = {i: array('q') for i in STREAM_OBJECTS + (ObjectClass.WELD, )}
+
+        with open(file_path, 'rb') as inp:
+            self.data = mmap.mmap(inp.fileno(), 0, access=mmap.ACCESS_READ) if inp.seek(0, 2) else b''
+
+        self.scan()
+
+    def __enter__(self):
+        """Use as context manager."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Release memory map on exit from context."""
+        self.close()
+
+    def __len__(self):
+        """Return number of rows in file."""
+        return len(self.dists)
+
+    def close(self):
+        """Release memory map."""
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+    def lines(self):
+        """Return iterator for (start, end) offsets of csv records after column titles row."""
+        data = self.data
+        size = len(data)
+        has_quotes = data.find(QUOTE) >= 0
+        pos = data.find(NEWLINE) + 1 if size else 0
+
+        while 0 < pos < size:
+            end = data.find(NEWLINE, pos)
+            end = size if end < 0 else end + 1
+            if has_quotes:
+                while (data[pos:end].count(QUOTE) % 2) and (end < size):
+                    end = data.find(NEWLINE, end)
+                    end = size if end < 0 else end + 1
+            yield pos, end
+            pos = end
+
+    def scan(self):
+        """Index offsets, distances and object types of rows."""
+        delimiter = self.file_cls.DELIMETER.encode()
+        data = self.data
+        last = None
+
+        for start, end in self.lines():
+            dist_end = data.find(delimiter, start, end)
+            type_end = data.find(delimiter, dist_end + 1, end)
+            if dist_end < 0:
+                continue  # empty line
+
+            try:
+                dist = int(data[start:dist_end])
+                type_object = int(data[dist_end + 1:type_end])
+            except ValueError as err:
+                raise Error("Wrong row at offset {}: {}".format(start, err)) from err
+
+            if (last is not None) and (dist < last):
+                raise Error("Unsorted dist {} after {}".format(dist, last))
+            last = dist
+
+            if type_object in self.positions:
+                self.positions[type_object].append(len(self.dists))
+            self.offsets.append(start)
+            self.dists.append(dist)
+            self.types.append(type_object)
+
+        self.offsets.append(len(data))
+
+    def rows(self, start=0, stop=None):
+        """Return iterator for rows from start to stop (exclusive) position, parsed from mapped data."""
+        stop = len(self) if stop is None else min(stop, len(self))
+        if start >= stop:
+            return
+
+        text = self.data[self.offsets[start]:self.offsets[stop]].decode(self.file_cls.ENCODING)
+        from_csv_row = self.file_cls.RowCls.from_csv_row
+        for row in csv.reader(io.StringIO(text, newline=''), delimiter=self.file_cls.DELIMETER):
+            if row:
+                yield from_csv_row(row)
+
+    def index_between(self, start, end):
+        """Return (first, stop) positions of rows with distance from start to end inclusive."""
+        return bisect_left(self.dists, start), bisect_right(self.dists, end)
+
+    def between(self, start, end):
+        """Return list of rows with distance from start to end inclusive."""
+        return list(self.rows(*self.index_between(start, end)))
+
+    def stream_rows(self, position):
+        """Return list of last category, diameter and thick rows between first weld and given position."""
+        result = []
+        for i in stream_positions(self.positions, len(self), position):
+            result.extend(self.rows(i, i + 1))
+
+        return result
+
+    def tubes_between(self, start, end, diameter=None, warns=None):
+        """Return iterator for tubes with start weld at distance from start to end inclusive.
+
+        Only rows of requested tubes are parsed, stream state (diameter, thick, category)
+        for first tube is restored from preceding rows. Tubes numbers are the same as for whole file.
+        """
+        welds = self.positions[ObjectClass.WELD]
+        first = bisect_left(welds, bisect_left(self.dists, start))
+        last = bisect_right(welds, bisect_right(self.dists, end) - 1)
+        if first >= last:
+            return []
+
+        stop = welds[last] + 1 if last < len(welds) else len(self)
+        obj = self.file_cls(diameter)
+        rows = restore_stream(obj.stream, self.stream_rows(welds[first]), self.rows(welds[first], stop))
+
+        return obj.get_tubes(warns, rows=obj.unique_rows(rows), auto_num=first + 1)
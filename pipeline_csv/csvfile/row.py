@@ -1,4 +1,8 @@
 """Csv file data row."""
+import re
+from functools import lru_cache
+from operator import attrgetter
+
 from .. import Error, ObjectClass, TypeHorWeld
 from ..orientation import Orientation
 
@@ -26,11 +30,60 @@ def to_int(text):
     return int(round(float(text.strip().replace(',', '.')), 0))
 
 
-def reverse_orient(orient_str):
-    """Reverse orientation of string in format "hours,minutes"."""
-    if not orient_str:
-        return orient_str
+def to_number(convert, value):
+    """Return number from csv field value by given convert function or None if value is not a number."""
+    if value == '':
+        return None
+    try:
+        return convert(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class NumField:
+    """Csv field, that holds source value along with number, parsed from it.
+
+    Source value is stored at slot '_<name>' and returned as is, so csv text is not changed.
+    Parsed number (or None for empty or malformed value) is stored at slot '<name>_num'.
+    """
 
+    def __init__(self, convert):
+        """Make field with given convert function for number."""
+        self.convert = convert
+        self.source = None
+        self.number = None
+
+    def __set_name__(self, owner, name):
+        """Set slot names for field owner."""
+        self.source = '_' + name
+        self.number = name + '_num'
+
+    def __get__(self, obj, objtype=None):
+        """Return source value."""
+        if obj is None:
+            return self
+        return getattr(obj, self.source)
+
+    def __set__(self, obj, value):
+        """Set source value and parsed number."""
+        setattr(obj, self.source, value)
+        setattr(obj, self.number, to_number(self.convert, value))
+
+    def checked(self, obj):
+        """Return parsed number or None for empty source value.
+
+        Raise error of convert function, if source value is not empty and is not a number.
+        """
+        number = getattr(obj, self.number)
+        if number is None:
+            value = getattr(obj, self.source)
+            if value not in ('', None):
+                return self.convert(value)
+        return number
+
+
+def calc_reverse_orient(orient_str):
+    """Calculate reversed orientation for string in format "hours,minutes"."""
     hours_str = orient_str
     minutes_str = '0'
     if ',' in orient_str:
@@ -55,6 +108,31 @@ def reverse_orient(orient_str):
     return "{},{}".format(hours, minutes)
 
 
+# reversed orientations for all possible strings in format "hours,minutes"
+REVERSE_ORIENT = {
+  text: calc_reverse_orient(text)
+  for text in ["{},{:02d}".format(hours, minutes) for hours in range(13) for minutes in range(60)]
+}
+
+
+def reverse_orient(orient_str):
+    """Reverse orientation of string in format "hours,minutes"."""
+    if not orient_str:
+        return orient_str
+
+    reversed_str = REVERSE_ORIENT.get(orient_str)
+    if reversed_str is None:
+        reversed_str = calc_reverse_orient(orient_str)
+
+    return reversed_str
+
+
+@lru_cache(maxsize=32)
+def comment_pattern(substrings):
+    """Return compiled regex for given tuple of comment substrings, longest substrings first."""
+    return re.compile('|'.join(re.escape(i) for i in sorted(substrings, key=len, reverse=True)))
+
+
 class Depth:
     """Units for defekt depth."""
 
@@ -62,10 +140,149 @@ class Depth:
     HundredthsOfMillimeter = 1
 
 
-class Row:  # pylint: disable=too-many-instance-attributes, too-many-public-methods
-    """Row of csv file."""
+class Category:
+    """Bit flags for categories of defect codes."""
+
+    METAL_LOSS = 1
+    DENT = 2
+    AT_WELD = 4
+    AT_SEAM = 8
+
+
+@lru_cache(maxsize=None)
+def categories_table(cls):
+    """Return dict with Category bit flags for defect codes of given row class."""
+    table = {}
+    for flag, codes in [
+      (Category.METAL_LOSS, cls.mloss_codes()),
+      (Category.DENT, cls.dents_codes()),
+      (Category.AT_WELD, cls.atweld_codes()),
+      (Category.AT_SEAM, cls.atseam_codes()),
+    ]:
+        for code in codes:
+            table[code] = table.get(code, 0) | flag
+
+    return table
+
+
+@lru_cache(maxsize=None)
+def valves_set(cls):
+    """Return frozenset of valve like object codes for given row class."""
+    return frozenset(cls.valve_codes())
+
+
+# row attributes for csv file columns, slots with text for numeric fields
+CSV_FIELDS = (
+  '_dist_od',
+  '_type_object',
+  '_object_code',
+  'object_name',
+  'object_code_t',
+  'marker',
+  '_length',
+  '_width',
+  '_depth_min',
+  '_depth_max',
+  'orient_td',
+  'orient_bd',
+  'mpoint_orient',
+  '_mpoint_dist',
+  '_type_def',
+  'dist_ml',
+  'dist_mr',
+  'dist_stl',
+  'dist_str',
+  'link_stl',
+  'link_str',
+  'link_ml',
+  'link_mr',
+  'comments',
+  'latitude',
+  'longtitude',
+  'altitude',
+)
+
+
+@lru_cache(maxsize=None)
+def state_fields(cls):
+    """Return tuple of slot names for given row class, slots of base classes first."""
+    return tuple(
+      name
+      for klass in reversed(cls.__mro__)
+      for name in klass.__dict__.get('__slots__', ())
+    )
+
+
+@lru_cache(maxsize=None)
+def state_getter(cls):
+    """Return function, that return tuple of slot values for row of given class."""
+    return attrgetter(*state_fields(cls))
+
 
-    depth_units = Depth.PercentWallThickness
+class Row:  # pylint: disable=too-many-instance-attributes, too-many-public-methods
+    """Row of csv file.
+
+    Row fields are stored in slots without per instance dict.
+    Subclasses must define own (maybe empty) __slots__ to keep memory footprint.
+
+    Numeric fields are parsed once on assignment, parsed values are available
+    as '<field>_num' attributes (None for empty or non numeric field).
+    """
+
+    __slots__ = (
+      '_dist_od',
+      'dist_od_num',
+      '_type_object',
+      'type_object_num',
+      '_object_code',
+      'object_code_num',
+      'object_name',
+      'object_code_t',
+      'is_marker_int',
+      '_length',
+      'length_num',
+      '_width',
+      'width_num',
+      '_depth_min',
+      'depth_min_num',
+      '_depth_max',
+      'depth_max_num',
+      'orient_td',
+      'orient_bd',
+      'mpoint_orient',
+      '_mpoint_dist',
+      'mpoint_dist_num',
+      '_type_def',
+      'type_def_num',
+      'dist_ml',
+      'dist_mr',
+      'dist_stl',
+      'dist_str',
+      'link_stl',
+      'link_str',
+      'link_ml',
+      'link_mr',
+      'comments',
+      'latitude',
+      'longtitude',
+      'altitude',
+      '_depth_units',
+    )
+
+    BASE_SLOTS = len(__slots__)
+
+    dist_od = NumField(int)
+    type_object = NumField(int)
+    object_code = NumField(int)
+    length = NumField(int)
+    width = NumField(int)
+    depth_min = NumField(float)
+    depth_max = NumField(float)
+    mpoint_dist = NumField(int)
+    type_def = NumField(int)
+
+    # return tuple of csv column values for given row
+    csv_values = staticmethod(attrgetter(*CSV_FIELDS))
 
     @staticmethod
     def get_bool(val):
@@ -132,23 +349,43 @@ class Row:  # pylint: disable=too-many-instance-attributes, too-many-public-meth
         """Return list of available valve like obect codes."""
         return []
 
+    @classmethod
+    def code_categories(cls):
+        """Return cached dict with Category bit flags for defect codes from *_codes lists."""
+        return categories_table(cls)
+
+    @classmethod
+    def valve_set(cls):
+        """Return cached frozenset of valve_codes."""
+        return valves_set(cls)
+
     def __init__(self):
         """Create empty csv row object."""
-        self.dist_od = None
-        self.type_object = None
-        self.object_code = 0
+        # slots of numeric fields are set directly, without NumField conversions
+        self._dist_od = None
+        self.dist_od_num = None
+        self._type_object = None
+        self.type_object_num = None
+        self._object_code = 0
+        self.object_code_num = 0
         self.object_name = ''
         self.object_code_t = ''
         self.is_marker_int = False
-        self.length = ''
-        self.width = ''
-        self.depth_min = ''
-        self.depth_max = ''
+        self._length = ''
+        self.length_num = None
+        self._width = ''
+        self.width_num = None
+        self._depth_min = ''
+        self.depth_min_num = None
+        self._depth_max = ''
+        self.depth_max_num = None
         self.orient_td = ''
         self.orient_bd = ''
         self.mpoint_orient = ''
-        self.mpoint_dist = ''
-        self.type_def = ''
+        self._mpoint_dist = ''
+        self.mpoint_dist_num = None
+        self._type_def = ''
+        self.type_def_num = None
         self.dist_ml = ''
         self.dist_mr = ''
         self.dist_stl = ''
@@ -161,11 +398,76 @@ class Row:  # pylint: disable=too-many-instance-attributes, too-many-public-meth
         self.latitude = ''
         self.longtitude = ''
         self.altitude = ''
+        self._depth_units = Depth.PercentWallThickness
+
+    def __getstate__(self):
+        """Return tuple of slot values and instance dict (None for rows without dict) for pickle."""
+        return state_getter(self.__class__)(self), getattr(self, '__dict__', None)
+
+    def __setstate__(self, state):
+        """Restore slot values and instance dict from pickled state."""
+        values, attributes = state
+        (
+          self._dist_od,
+          self.dist_od_num,
+          self._type_object,
+          self.type_object_num,
+          self._object_code,
+          self.object_code_num,
+          self.object_name,
+          self.object_code_t,
+          self.is_marker_int,
+          self._length,
+          self.length_num,
+          self._width,
+          self.width_num,
+          self._depth_min,
+          self.depth_min_num,
+          self._depth_max,
+          self.depth_max_num,
+          self.orient_td,
+          self.orient_bd,
+          self.mpoint_orient,
+          self._mpoint_dist,
+          self.mpoint_dist_num,
+          self._type_def,
+          self.type_def_num,
+          self.dist_ml,
+          self.dist_mr,
+          self.dist_stl,
+          self.dist_str,
+          self.link_stl,
+          self.link_str,
+          self.link_ml,
+          self.link_mr,
+          self.comments,
+          self.latitude,
+          self.longtitude,
+          self.altitude,
+          self._depth_units,
+        ) = values[:self.BASE_SLOTS]
+
+        if len(values) > self.BASE_SLOTS:
+            for name, value in zip(state_fields(self.__class__)[self.BASE_SLOTS:], values[self.BASE_SLOTS:]):
+                setattr(self, name, value)
+
+        if attributes:
+            self.__dict__.update(attributes)
 
     def __str__(self):
         """As text."""
         return ';'.join([str(i) for i in self.values()])
 
+    @property
+    def depth_units(self):
+        """Return units for defekt depth."""
+        return self._depth_units
+
+    @depth_units.setter
+    def depth_units(self, value):
+        """Set units for defekt depth."""
+        self._depth_units = value
+
     @property
     def marker(self):
         """Return string for marker feature."""
@@ -183,10 +485,19 @@ class Row:  # pylint: disable=too-many-instance-attributes, too-many-public-meth
         """Return marker feature as bool."""
         return self.is_lineobj and self.is_marker_int
 
+    def num(self, name):
+        """Return number of numeric field with given name or None for empty field.
+
+        Raise ValueError, if field is not empty and is not a number.
+        """
+        return getattr(self.__class__, name).checked(self)
+
     @property
     def dist(self):
         """Return object distance as integer mm."""
-        return int(self.dist_od)
+        if self.dist_od_num is None:
+            return int(self.dist_od)  # raise error for wrong distance
+        return self.dist_od_num
 
     @property
     def obj_id(self):
@@ -412,67 +723,53 @@ class Row:  # pylint: disable=too-many-instance-attributes, too-many-public-meth
         """Construct from csv row."""
         obj = cls()
 
-        obj.dist_od = row[0]
-        obj.type_object = row[1]
-        obj.object_code = row[2]
-        obj.object_name = row[3]
-        obj.object_code_t = row[4]
-        obj.marker = row[5]
-        obj.length = row[6]
-        obj.width = row[7]
-        obj.depth_min = row[8]
-        obj.depth_max = row[9]
-        obj.orient_td = row[10]
-        obj.orient_bd = row[11]
-        obj.mpoint_orient = row[12]
-        obj.mpoint_dist = row[13]
-        obj.type_def = row[14]
-        obj.dist_ml = row[15]
-        obj.dist_mr = row[16]
-        obj.dist_stl = row[17]
-        obj.dist_str = row[18]
-        obj.link_stl = row[19]
-        obj.link_str = row[20]
-        obj.link_ml = row[21]
-        obj.link_mr = row[22]
-        obj.comments = row[23]
-        obj.latitude = row[24]
-        obj.longtitude = row[25]
-        obj.altitude = row[26]
+        # fill slots directly, numeric fields parsed only once
+        (
+          obj._dist_od,
+          obj._type_object,
+          obj._object_code,
+          obj.object_name,
+          obj.object_code_t,
+          marker,
+          obj._length,
+          obj._width,
+          obj._depth_min,
+          obj._depth_max,
+          obj.orient_td,
+          obj.orient_bd,
+          obj.mpoint_orient,
+          obj._mpoint_dist,
+          obj._type_def,
+          obj.dist_ml,
+          obj.dist_mr,
+          obj.dist_stl,
+          obj.dist_str,
+          obj.link_stl,
+          obj.link_str,
+          obj.link_ml,
+          obj.link_mr,
+          obj.comments,
+          obj.latitude,
+          obj.longtitude,
+          obj.altitude,
+        ) = row[:27]
+
+        obj.marker = marker
+        obj.dist_od_num = to_number(int, obj._dist_od)
+        obj.type_object_num = to_number(int, obj._type_object)
+        obj.object_code_num = to_number(int, obj._object_code)
+        obj.length_num = to_number(int, obj._length)
+        obj.width_num = to_number(int, obj._width)
+        obj.depth_min_num = to_number(float, obj._depth_min)
+        obj.depth_max_num = to_number(float, obj._depth_max)
+        obj.mpoint_dist_num = to_number(int, obj._mpoint_dist)
+        obj.type_def_num = to_number(int, obj._type_def)
 
         return obj
 
     def values(self):
         """Column values for row."""
-        return [
-          self.dist_od,
-          self.type_object,
-          self.object_code,
-          self.object_name,
-          self.object_code_t,
-          self.marker,
-          self.length,
-          self.width,
-          self.depth_min,
-          self.depth_max,
-          self.orient_td,
-          self.orient_bd,
-          self.mpoint_orient,
-          self.mpoint_dist,
-          self.type_def,
-          self.dist_ml,
-          self.dist_mr,
-          self.dist_stl,
-          self.dist_str,
-          self.link_stl,
-          self.link_str,
-          self.link_ml,
-          self.link_mr,
-          self.comments,
-          self.latitude,
-          self.longtitude,
-          self.altitude,
-        ]
+        return list(self.csv_values(self))
 
     def copy(self):
         """Create copy of row."""
@@ -520,74 +817,77 @@ class Row:  # pylint: disable=too-many-instance-attributes, too-many-public-meth
     @property
     def is_category(self):
         """Row is pipeline category object."""
-        return int(self.type_object) == ObjectClass.PIPELINE_CATEGORY
+        return self.type_object_num == ObjectClass.PIPELINE_CATEGORY
 
     @property
     def is_thick(self):
         """Row is wall thick change object."""
-        return int(self.type_object) == ObjectClass.THICK
+        return self.type_object_num == ObjectClass.THICK
 
     @property
     def is_diam(self):
         """Row is diameter change object."""
-        return int(self.type_object) == ObjectClass.DIAM
+        return self.type_object_num == ObjectClass.DIAM
 
     @property
     def is_weld(self):
         """Row is weld object."""
-        return int(self.type_object) == ObjectClass.WELD
+        return self.type_object_num == ObjectClass.WELD
 
     @property
     def is_defect(self):
         """Row is defect object."""
-        return int(self.type_object) == ObjectClass.DEFEKT
+        return self.type_object_num == ObjectClass.DEFEKT
 
     @property
     def is_lineobj(self):
         """Row is line object."""
-        return int(self.type_object) == ObjectClass.MARKER
+        return self.type_object_num == ObjectClass.MARKER
 
     @property
     def is_seam(self):
         """Row is seam object."""
-        return int(self.type_object) == ObjectClass.HOR_WELD
+        return self.type_object_num == ObjectClass.HOR_WELD
 
     @property
     def is_valve(self):
         """Return True if item is valve like object."""
-        return self.is_lineobj and (int(self.object_code) in self.valve_codes())
+        return self.is_lineobj and (self.object_code_num in valves_set(self.__class__))
 
     def reverse(self, total_length):
         """Reverse dist, orientation and start point if objects with length."""
         my_length = 0
         if self.length:
-            my_length = int(self.length)
+            my_length = self.num('length')
 
-        self.dist_od = str(total_length - int(self.dist_od) - my_length)
+        self.dist_od = str(total_length - self.dist - my_length)
 
         if self.mpoint_dist:
-            self.mpoint_dist = str(total_length - int(self.mpoint_dist))
+            self.mpoint_dist = str(total_length - self.num('mpoint_dist'))
 
         # orientatations
-        self.orient_td = reverse_orient(self.orient_td)
-        self.orient_bd = reverse_orient(self.orient_bd)
+        orient_td = reverse_orient(self.orient_td)
+        orient_bd = reverse_orient(self.orient_bd)
 
-        if int(self.type_object) != ObjectClass.HOR_WELD:
-            tmp = self.orient_bd
-            self.orient_bd = self.orient_td
-            self.orient_td = tmp
+        if self.type_object_num == ObjectClass.HOR_WELD:
+            self.orient_td, self.orient_bd = orient_td, orient_bd
+        else:
+            self.orient_td, self.orient_bd = orient_bd, orient_td
 
         self.mpoint_orient = reverse_orient(self.mpoint_orient)
 
         # object type
-        if int(self.type_object) == ObjectClass.MARKER:
-            object_code = int(self.object_code)
+        if self.type_object_num == ObjectClass.MARKER:
+            object_code = self.num('object_code')
             self.object_code = str(self.markers_reverse().get(object_code, object_code))
-        elif int(self.type_object) == ObjectClass.DIAM:
+        elif self.type_object_num == ObjectClass.DIAM:
             self.depth_min, self.depth_max = self.depth_max, self.depth_min
 
         # comments
-        for key, val in self.comment_reverse().items():
-            if key in self.comments:
-                self.comments = self.comments.replace(key, val)
-                break
+        if self.comments:
+            replaces = self.comment_reverse()
+            if replaces:
+                self.comments = comment_pattern(tuple(replaces)).sub(
+                  lambda match: replaces[match.group(0)],
+                  self.comments
+                )
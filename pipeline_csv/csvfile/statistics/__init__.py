@@ -1,4 +1,133 @@
-"""Statistics for CSV file objects."""
+"""Statistics for CSV file objects.
+
+Statistics objects have merge method, that add data of other object with the same settings,
+so statistics for parts of csv file can be collected independently and merged in order of parts.
+"""
+from copy import deepcopy
+
+
+def merge_dict(data, other):
+    """Add to dict of statistics objects (or numbers) items from other dict. Return given dict."""
+    for key, val in other.items():
+        if key in data:
+            if isinstance(val, (int, float)):
+                data[key] += val
+            else:
+                data[key].merge(val)
+        else:
+            data[key] = deepcopy(val)
+
+    return data
+
+
+def merge_attributes(obj, other):
+    """Merge all attributes of obj, that are statistics objects, with same attributes of other object."""
+    for name, val in vars(obj).items():
+        if hasattr(val, 'merge'):
+            val.merge(getattr(other, name))
+
+    return obj
+
+
+def tube_ordinal(tube):
+    """Return ordinal number of tube in csv file (auto number), that used in sets of tubes.
+
+    Return None for tube without auto number (File.last_pipe) or with not numeric auto number.
+    """
+    try:
+        ordinal = int(tube.auto_number)
+    except (TypeError, ValueError):
+        return None
+
+    return ordinal if ordinal >= 0 else None
+
+
+class TubeSet:
+    """Set of tubes ordinal numbers, stored as bits of bytearray.
+
+    Tubes without ordinal number are stored by Tube.number in names set.
+    """
+
+    __slots__ = ('bits', 'number', 'names')
+
+    def __init__(self, ordinals=()):
+        """Make set with given tubes ordinal numbers."""
+        self.bits = bytearray()
+        self.number = 0
+        self.names = None
+        for ordinal in ordinals:
+            self.add(ordinal)
+
+    def __len__(self):
+        """Return number of tubes in set."""
+        return self.number + len(self.names or ())
+
+    def __contains__(self, ordinal):
+        """Return True if tube with given ordinal number is in set."""
+        byte, bit = divmod(ordinal, 8)
+        return (byte < len(self.bits)) and bool(self.bits[byte] & (1 << bit))
+
+    def __iter__(self):
+        """Return iterator for ordinal numbers of tubes in ascending order, then numbers of tubes without ordinal."""
+        for byte, value in enumerate(self.bits):
+            if value:
+                for bit in range(8):
+                    if value & (1 << bit):
+                        yield byte * 8 + bit
+
+        yield from self.names or ()
+
+    def __eq__(self, other):
+        """Return True if sets contain the same tubes."""
+        return isinstance(other, TubeSet) and (self.as_int() == other.as_int()) and (
+          (self.names or set()) == (other.names or set())
+        )
+
+    __hash__ = None
+
+    def __repr__(self):
+        """As text."""
+        return "TubeSet({})".format(list(self))
+
+    def as_int(self):
+        """Return bits of set as integer."""
+        return int.from_bytes(self.bits, 'little')
+
+    def add(self, ordinal):
+        """Add tube with given ordinal number."""
+        byte = ordinal >> 3
+        if byte >= len(self.bits):
+            self.bits.extend(bytes(byte + 1 - len(self.bits)))
+
+        mask = 1 << (ordinal & 7)
+        if not self.bits[byte] & mask:
+            self.bits[byte] |= mask
+            self.number += 1
+
+    def add_tube(self, tube):
+        """Add tube by ordinal number or by Tube.number, if tube has no ordinal number."""
+        ordinal = tube_ordinal(tube)
+        if ordinal is not None:
+            self.add(ordinal)
+        elif self.names is None:
+            self.names = {tube.number}
+        else:
+            self.names.add(tube.number)
+
+    def update(self, *others):
+        """Add tubes from other sets."""
+        value = self.as_int()
+        size = len(self.bits)
+        for other in others:
+            value |= other.as_int()
+            size = max(size, len(other.bits))
+            if other.names:
+                self.names = (self.names or set()) | other.names
+
+        self.bits = bytearray(value.to_bytes(size, 'little'))
+        self.number = bin(value).count('1')
+
+        return self
 
 
 class Counter:
@@ -16,12 +145,20 @@ class Counter:
         """Add new tube data."""
         self.number += 1
 
+    def merge(self, other):
+        """Add counter of other object."""
+        self.number += other.number
+        return self
+
 
 class PropertyCounter:
     """Class for counting objects by field values."""
 
     def __init__(self):
-        """Make new object with empty properies."""
+        """Make new object with empty properies.
+
+        Tubes with item are stored as TubeSet of tubes ordinal numbers for every field value.
+        """
         self.data = {}
         self.tubes = {}
         self.number = 0
@@ -39,11 +176,7 @@ class PropertyCounter:
 
     def tubes_all(self):
         """Return number of tubes for all item."""
-        all_pipes = {}
-        for i in self.tubes.values():
-            all_pipes.update(i)
-
-        return len(all_pipes)
+        return len(TubeSet().update(*self.tubes.values()))
 
     def add_item(self, val, tube):
         """Add item by field value to statistics."""
@@ -51,7 +184,17 @@ class PropertyCounter:
 
         if val in self.data:
             self.data[val].increment()
-            self.tubes[val][tube.number] = True
         else:
             self.data[val] = Counter()
-            self.tubes[val] = {tube.number: True}
+            self.tubes[val] = TubeSet()
+
+        self.tubes[val].add_tube(tube)
+
+    def merge(self, other):
+        """Add items and tubes of other object."""
+        self.number += other.number
+        merge_dict(self.data, other.data)
+        for val, tubes in other.tubes.items():
+            self.tubes.setdefault(val, TubeSet()).update(tubes)
+
+        return self
@@ -1,5 +1,9 @@
 """Defects statistics."""
-from . import PropertyCounter
+from bisect import bisect_right
+from itertools import accumulate
+from functools import lru_cache
+from ... import Error
+from . import PropertyCounter, TubeSet, merge_dict, merge_attributes
 
 GRADE_OVER_MAX = "OVER_MAX"
 
@@ -49,6 +53,15 @@ def at_hours(minutes_start, minutes_end):
     return hours
 
 
+@lru_cache(maxsize=None)
+def hours_at(minutes_start, minutes_end):
+    """Return cached tuple of hours where segment present, see at_hours.
+
+    Arguments are integer minutes (or None), so cache size is limited by number of minutes pairs.
+    """
+    return tuple(at_hours(minutes_start, minutes_end))
+
+
 class Angles:
     """Class for counting defects by angles."""
 
@@ -59,12 +72,29 @@ class Angles:
     def add_data(self, defect):
         """Add defect to angle statistics."""
         if defect.row.orient1:
-            for i in at_hours(defect.row.orient1, defect.row.orient2):
+            for i in hours_at(defect.row.orient1, defect.row.orient2):
                 self.hours[i] += 1
 
+    def merge(self, other):
+        """Add angles of other object."""
+        merge_dict(self.hours, other.hours)
+        return self
+
+
+def grade_bounds(grades):
+    """Return list of float bounds for binary search of first grade, that greater than value.
+
+    Bound is maximum of grades from first to current, so bounds are sorted for any order of grades.
+    """
+    return list(accumulate((float(grade) for grade in grades), max))
+
 
 class GradeBase:
-    """Class for counting defects by grade."""
+    """Class for counting defects by grade.
+
+    Defect get first grade from grades list, that greater than defect value, or GRADE_OVER_MAX.
+    Grades must not be changed after object creation, bounds for binary search are built once.
+    """
 
     grades = []
 
@@ -76,6 +106,21 @@ class GradeBase:
         self.number = 0
         self.data = {}
         self.grade_init()
+        self.bounds = grade_bounds(self.grades)
+
+    def grade_for(self, val):
+        """Return first grade, that greater than given numeric value, or GRADE_OVER_MAX."""
+        index = bisect_right(self.bounds, val)
+        if index < len(self.bounds):
+            return self.grades[index]
+
+        return GRADE_OVER_MAX
+
+    def grade_indexes(self, values):
+        """Return NumPy array of grades positions for array of values. Position of GRADE_OVER_MAX is len(grades)."""
+        import numpy as np
+
+        return np.searchsorted(np.asarray(self.bounds, dtype=float), np.asarray(values, dtype=float), side='right')
 
     def grade_init(self):
         """Stub for chield classes."""
@@ -89,16 +134,34 @@ class GradeBase:
         """Stub for chield classes."""
         stub_for_child(self, "add_item")
 
+    def merge_data(self, _other):
+        """Stub for chield classes."""
+        stub_for_child(self, "merge_data")
+
+    def merge(self, other):
+        """Add defects of other object with the same grades."""
+        if list(self.grades) != list(other.grades):
+            raise Error("Can't merge {} with different grades".format(self.__class__.__name__))
+
+        self.number += other.number
+        self.merge_data(other)
+        return self
+
     def add_data(self, defect):
         """Add defect with grade to statistics."""
         val = self.get_grade(defect, defect.pipe) or 0
         self.number += 1
-        for grade in self.grades:
-            if float(val) < float(grade):
-                self.add_item(grade, defect, defect.pipe)
-                return
+        self.add_item(self.grade_for(float(val)), defect, defect.pipe)
 
-        self.add_item(GRADE_OVER_MAX, defect, defect.pipe)
+    def add_many(self, defects):
+        """Add list of defects with grades, found for all values at once. Require numpy package."""
+        defects = list(defects)
+        grades = list(self.grades) + [GRADE_OVER_MAX]
+        indexes = self.grade_indexes([float(self.get_grade(defect, defect.pipe) or 0) for defect in defects])
+
+        self.number += len(defects)
+        for defect, index in zip(defects, indexes.tolist()):
+            self.add_item(grades[index], defect, defect.pipe)
 
     def extended_number(self, _grade):
         """Additional number for grade."""
@@ -117,6 +180,11 @@ class GradeHolder(GradeBase):
         """Add to container."""
         self.data[grade].append(defect)
 
+    def merge_data(self, other):
+        """Add defects of other object to containers."""
+        for grade, defects in other.data.items():
+            self.data[grade].extend(defects)
+
 
 class SingleDist(GradeHolder):
     """Class for collecting items without grades."""
@@ -129,6 +197,11 @@ class SingleDist(GradeHolder):
         self.number += 1
         self.add_item(self.single_grade, defect, defect.pipe)
 
+    def add_many(self, defects):
+        """Add list of defects with fixed grade to statistics."""
+        for defect in defects:
+            self.add_data(defect)
+
 
 class GradeTube(GradeBase):
     """Class for counting defects at tubes by grade."""
@@ -138,13 +211,19 @@ class GradeTube(GradeBase):
         self.data = {i: 0 for i in self.grades}
         self.data[GRADE_OVER_MAX] = 0
 
-        self.tubes = {i: {} for i in self.grades}
-        self.tubes[GRADE_OVER_MAX] = {}
+        self.tubes = {i: TubeSet() for i in self.grades}
+        self.tubes[GRADE_OVER_MAX] = TubeSet()
 
     def add_item(self, grade, _defect, tube):
         """Add to counter and tubes."""
         self.data[grade] += 1
-        self.tubes[grade][tube.number] = True
+        self.tubes[grade].add_tube(tube)
+
+    def merge_data(self, other):
+        """Add counters and tubes of other object."""
+        merge_dict(self.data, other.data)
+        for grade, tubes in other.tubes.items():
+            self.tubes[grade].update(tubes)
 
     def __str__(self):
         """Text representation."""
@@ -180,6 +259,11 @@ class Depth(GradeTube):
         super().add_item(grade, defect, tube)
         self.max_percent = max((defect.depth_percent or 0), self.max_percent)
 
+    def merge_data(self, other):
+        """Add counters, tubes and max depth of other object."""
+        super().merge_data(other)
+        self.max_percent = max(other.max_percent, self.max_percent)
+
     def get_grade(self, defect, _tube):
         """Return depth in percents for defect."""
         return defect.depth_percent or 0
@@ -210,21 +294,32 @@ class Dist(GradeTube):
 
         GradeTube.__init__(self)
 
+    def merge_data(self, other):
+        """Add counters, tubes and valves names of other object."""
+        super().merge_data(other)
+        self.names.update(other.names)
+
 
 class DistDanger(Dist):
     """Class for counting defects by distance with stacked danger levels."""
 
     def add_data(self, defect):
         """Add defect with distance to statistics."""
-        val = defect.row.dist_od
         self.number += 1
+        self.data[self.grade_for(defect.row.dist)] += 1
+
+    def add_many(self, defects):
+        """Add list of defects with distance to statistics at once. Require numpy package."""
+        import numpy as np
 
-        for grade in self.grades:
-            if int(val) < grade:
-                self.data[grade] += 1
-                return
+        dists = [defect.row.dist for defect in defects]
+        grades = list(self.grades) + [GRADE_OVER_MAX]
+        counts = np.bincount(self.grade_indexes(dists), minlength=len(grades)).tolist()
 
-        self.data[GRADE_OVER_MAX] += 1
+        self.number += len(dists)
+        for grade, count in zip(grades, counts):
+            if count:
+                self.data[grade] += count
 
 
 class DangerValve(DistDanger):
@@ -248,6 +343,12 @@ class PropertyCodeCounter(PropertyCounter):
         self.add_item(code, tube)
         self.code2text[code] = text
 
+    def merge(self, other):
+        """Add items, tubes and codes texts of other object."""
+        super().merge(other)
+        self.code2text.update(other.code2text)
+        return self
+
 
 class DistBarStacked:
     """Counter by given property."""
@@ -263,11 +364,41 @@ class DistBarStacked:
 
     def add_data(self, item, prop):
         """Add item with by property."""
-        val = prop.get_val(item)
+        self.add_number(prop.get_val(item), 1)
+
+    def add_number(self, val, number):
+        """Add given number of items with property value."""
         if val not in self.data:
             self.data[val] = 0
-        self.data[val] += 1
-        self.number += 1
+        self.data[val] += number
+        self.number += number
+
+    def merge(self, other):
+        """Add counters of other object."""
+        self.number += other.number
+        merge_dict(self.data, other.data)
+        return self
+
+
+def stacked_counts(nodes, dists, values):
+    """Return list of (node, value, number) for NumPy arrays of distances and values inside sorted nodes.
+
+    Node is start point of segment for distance, see DistStacked.get_node.
+    Pairs of node and value are ordered by first appearance in arrays.
+    """
+    import numpy as np
+
+    positions = np.searchsorted(np.asarray(nodes, dtype=float), dists, side='right') - 1
+    uniques, codes = np.unique(values, return_inverse=True)
+    pairs, first, counts = np.unique(positions * len(uniques) + codes.ravel(), return_index=True, return_counts=True)
+    uniques = uniques.tolist()
+    result = []
+
+    for i in np.argsort(first, kind='stable').tolist():
+        position, code = divmod(int(pairs[i]), len(uniques))
+        result.append((nodes[position], uniques[code], int(counts[i])))
+
+    return result
 
 
 class DistStacked:  # pylint: disable=too-many-instance-attributes
@@ -332,13 +463,50 @@ class DistStacked:  # pylint: disable=too-many-instance-attributes
         self.data[self.get_node(item.row.dist)].add_data(item, self)
         self.number += 1
 
+    def add_array(self, dists, values, items=None):
+        """Add arrays of items distances and property values at once. Require numpy package.
+
+        Items out of range are added to before_start and after_end lists from items sequence
+        or as distances, if items is not set.
+        """
+        import numpy as np
+
+        dists = np.asarray(dists, dtype=float)
+        values = np.asarray(values)
+        items = dists.tolist() if items is None else items
+        before = dists < self.start
+        after = dists > (self.start + self.length)
+        self.before_start.extend(items[i] for i in np.flatnonzero(before).tolist())
+        self.after_end.extend(items[i] for i in np.flatnonzero(after).tolist())
+
+        inside = ~(before | after)
+        for node, val, number in stacked_counts(self.nodes, dists[inside], values[inside]):
+            self.data[node].add_number(val, number)
+            self.number += number
+
+    def add_many(self, items):
+        """Add list of items with distance at once. Require numpy package."""
+        items = list(items)
+        self.add_array([item.row.dist for item in items], [self.get_val(item) for item in items], items)
+
+    def merge(self, other):
+        """Add bars and out of range items of other object with the same range and bars."""
+        if (self.start, self.length, self.nodes) != (other.start, other.length, other.nodes):
+            raise Error("Can't merge {} with different bars".format(self.__class__.__name__))
+
+        self.number += other.number
+        merge_dict(self.data, other.data)
+        self.before_start.extend(other.before_start)
+        self.after_end.extend(other.after_end)
+        return self
+
 
 class DistWallside(DistStacked):
     """Class for stacked defect bars with wallside parts."""
 
     def get_val(self, item):
         """Return wallside property value of defect."""
-        return int(item.row.type_def)
+        return item.row.num('type_def')
 
 
 class DistSingle(DistStacked):
@@ -375,8 +543,8 @@ class Totals:
     def add_defect(self, defect, tube, _warns):
         """Add defect to statistics."""
         row = defect.row
-        self.base_wallside.add_item(int(row.type_def), tube)
-        self.base_types.add_item(int(row.object_code), tube)
+        self.base_wallside.add_item(row.num('type_def'), tube)
+        self.base_types.add_item(row.num('object_code'), tube)
         self.base_angle_anomalies.add_data(defect)
 
     def add_data(self, tube, warns):
@@ -384,3 +552,11 @@ class Totals:
         for defect in tube.defects:
             self.number += 1
             self.add_defect(defect, tube, warns)
+
+    def merge(self, other):
+        """Add statistics of other object, including statistics attributes of child classes.
+
+        Objects must be created with the same start, length and markers.
+        """
+        self.number += other.number
+        return merge_attributes(self, other)
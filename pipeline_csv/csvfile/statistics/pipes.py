@@ -1,5 +1,5 @@
 """Pipes statistics."""
-from . import Counter
+from . import Counter, merge_dict, merge_attributes
 
 
 class CounterLength(Counter):
@@ -19,6 +19,12 @@ class CounterLength(Counter):
         Counter.increment(self)
         self.length += tube_length
 
+    def merge(self, other):
+        """Add counter and length of other object."""
+        Counter.merge(self, other)
+        self.length += other.length
+        return self
+
 
 class TubeProperty:
     """Class for one tubes property statistics."""
@@ -47,6 +53,13 @@ class TubeProperty:
         else:
             self.data[val] = CounterLength(tube_length)
 
+    def merge(self, other):
+        """Add tubes data of other object."""
+        self.number += other.number
+        self.length += other.length
+        merge_dict(self.data, other.data)
+        return self
+
 
 class Totals:
     """Class for tubes report statistics."""
@@ -81,3 +94,9 @@ class Totals:
         self.thick.add_data(tube.thick, tube.length)
         self.category.add_data(tube.category, tube.length)
         self.types.add_data(tube.typ, tube.length)
+
+    def merge(self, other):
+        """Add statistics of other object, including statistics attributes of child classes."""
+        self.number += other.number
+        self.length += other.length
+        return merge_attributes(self, other)
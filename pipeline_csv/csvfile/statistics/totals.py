@@ -1,9 +1,57 @@
 """Main class for CSV file statistics."""
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
+from ..tubes import restore_stream
 from . import PropertyCounter
 from .pipes import Totals as TotalsPipes
 from .defects import Totals as TotalsDefects
 
 
+def is_marker(row):
+    """Return True if line object row is marker."""
+    return row.marker == row.get_bool(True)
+
+
+# csv file for fill_shard in worker process, is set by init_shards
+SHARDS_FILE = {}
+
+
+def init_shards(deftable):
+    """Set csv file for fill_shard calls in worker process.
+
+    Worker processes get csv file once on start (without pickling for 'fork' start method).
+    """
+    SHARDS_FILE['deftable'] = deftable
+
+
+def fill_shard(totals, shard):
+    """Return (totals, tubes warns, defects warns) for part of csv file rows, see Totals.fill_parallel.
+
+    Given totals object is filled with tubes of shard rows, but without markers.
+    """
+    first, stop, auto_num, start, length, markers = shard
+    index = SHARDS_FILE['deftable'].sorted_index()
+    deftable = SHARDS_FILE['deftable'].__class__(SHARDS_FILE['deftable'].initial_diameter)
+    warns = []
+    defect_warns = []
+    last_tube = None
+
+    totals.init_fill()
+    totals.defects = totals.defects_class(start, length, markers, ext_params=totals.defects_params)
+
+    rows = restore_stream(deftable.stream, index.stream_rows(first) if first else [], index.rows[first:stop])
+    for tube in deftable.get_tubes(warns, rows=rows, auto_num=auto_num):
+        if last_tube is None:
+            totals.start = tube.dist
+        last_tube = tube
+        totals.add_data(tube)
+        totals.defects.add_data(tube, defect_warns)
+
+    totals.length = last_tube.dist + int(last_tube.length) - totals.start
+
+    return totals, warns, defect_warns
+
+
 class Totals:
     """Class for overall CSV file statistics."""
 
@@ -34,10 +82,19 @@ class Totals:
         self.start = None
         self.length = None
 
-    def fill(self, deftable, warns):
-        """Make statistics for given deftable."""
+    def fill(self, deftable, warns, single_pass=True):
+        """Make statistics for given deftable.
+
+        In single pass mode tubes with defects are kept in memory until markers and length of trace are known,
+        otherwise tubes of deftable are created twice.
+        Whole tubes are kept, because defects statistics (add_data of defects_class) get tube objects
+        and every defect refers to own tube by Defect.pipe anyway. So single pass mode holds in memory
+        all tubes with defects (with their rows) instead of second creation of tubes.
+        Use single_pass=False for big files with many defects, when memory is limited.
+        """
         self.init_fill()
         last_tube = None
+        defect_tubes = []
 
         for tube in deftable.get_tubes(warns):
             if last_tube is None:
@@ -45,15 +102,111 @@ class Totals:
             last_tube = tube
             self.add_data(tube)
             for item in tube.lineobjects:
-                if item.marker == item.get_bool(True):
+                if is_marker(item):
                     self.markers.append(item)
+            if single_pass and tube.defects:
+                defect_tubes.append(tube)
 
         self.length = last_tube.dist + int(last_tube.length) - self.start
         self.defects = self.defects_class(self.start, self.length, self.markers, ext_params=self.defects_params)
 
-        for tube in deftable.get_tubes():
+        for tube in (defect_tubes if single_pass else deftable.get_tubes()):
             self.defects.add_data(tube, warns)
 
+    def shards(self, deftable, number):
+        """Return list of shards for fill_shard with tubes of deftable, divided to given number of parts.
+
+        Shard is tuple (first row position, stop row position, number of first tube, start, length, markers)
+        for rows, sorted by distance.
+        First shard include rows before first weld and last shard include rows after last weld.
+        """
+        index = deftable.sorted_index()
+        rows, welds = index.rows, index.welds
+        tubes_number = len(welds) - 1
+        start = rows[welds[0]].dist
+        length = int(rows[welds[-1]].dist) - start
+        markers = [
+          row for row in rows[welds[0] + 1:welds[-1]]
+          if (not row.is_defect) and row.is_lineobj and is_marker(row)
+        ]
+        bounds = [tubes_number * i // number for i in range(number + 1)]
+        result = []
+
+        for i in range(number):
+            first = welds[bounds[i]] if i else 0
+            stop = welds[bounds[i + 1]] + 1 if i < (number - 1) else len(rows)
+            result.append((
+              first,
+              stop,
+              bounds[i] + 1,
+              start,
+              length,
+              markers,
+            ))
+
+        return result
+
+    def fill_parallel(self, deftable, warns, workers):
+        """Make statistics for given deftable by pool of given number of processes.
+
+        Tubes of deftable are divided to shards by welds, statistics of shards are merged in order of shards.
+        Pipes and defects classes must be importable for worker processes.
+        Objects in statistics (defects, markers) are copies of deftable objects.
+        """
+        deftable.invalidate()  # rows may be changed inplace after index was built
+        welds = deftable.sorted_index().welds
+        number = min(workers, len(welds) - 1)
+        if number < 2:
+            self.fill(deftable, warns)
+            return
+
+        shards = self.shards(deftable, number)
+        self.init_fill()
+        self.defects = None
+        tube_warns = []
+        defect_warns = []
+
+        with ProcessPoolExecutor(max_workers=number, initializer=init_shards, initargs=(deftable, )) as pool:
+            for part, part_warns, part_defect_warns in pool.map(fill_shard, repeat(self), shards):
+                self.merge(part)
+                tube_warns.extend(part_warns)
+                defect_warns.extend(part_defect_warns)
+
+        if warns is not None:
+            warns.extend(tube_warns + defect_warns)
+        self.markers = shards[0][-1]
+
+    def merge(self, other):
+        """Add statistics of other object, filled for next part of csv file.
+
+        Defects statistics of both objects must be created with the same start, length and markers.
+        If object has no defects statistics, defects statistics of other object is used.
+        """
+        if other.pipes is None:
+            return self
+        if self.pipes is None:
+            self.init_fill()
+
+        self.pipes.merge(other.pipes)
+        self.liners.merge(other.liners)
+        self.markers.extend(other.markers)
+
+        if other.start is not None:
+            end = other.start + other.length
+            if self.start is not None:
+                end = max(end, self.start + self.length)
+                self.start = min(self.start, other.start)
+            else:
+                self.start = other.start
+            self.length = end - self.start
+
+        if self.defects is None:
+            self.defects = other.defects
+        elif other.defects is not None:
+            self.defects.merge(other.defects)
+
+        return self
+
     def __str__(self):
         """Text representation."""
         return ''.join((
@@ -67,6 +220,6 @@ class Totals:
     def add_data(self, tube):
         """Add tube data to report statistics."""
         for obj in tube.lineobjects:
-            self.liners.add_item(int(obj.object_code), tube)
+            self.liners.add_item(obj.num('object_code'), tube)
 
         self.pipes.add_data(tube)
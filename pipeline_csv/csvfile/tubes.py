@@ -10,7 +10,7 @@ def summary_text(objects, names):
     """Return summary text for given items."""
     items = {}
     for item in objects:
-        code = int(item.object_code)
+        code = item.num('object_code')
         if code in items:
             items[code] += 1
         else:
@@ -19,13 +19,27 @@ def summary_text(objects, names):
     return ', '.join(["{}: {}".format(names.get(key, '??'), items[key]) for key in sorted(items.keys())])
 
 
-class Tube:  # pylint: disable=too-many-instance-attributes
+def restore_stream(stream, stream_rows, rows):
+    """Return iterator for rows, that set stream state by stream_rows before first row.
+
+    Stream rows are last category, diameter and thick rows before first row.
+    """
+    pipe = None
+    for row in stream_rows:
+        if pipe is None:
+            pipe = Tube(row, stream, None)
+        pipe.add_object(row)
+
+    yield from rows
+
+
+class Tube:  # pylint: disable=too-many-instance-attributes, too-many-public-methods
     """Represent one pipe."""
 
     def __init__(self, row, stream, auto_number):
         """Construct new tube object from csv row with given data stream state."""
         self.row = row
-        self.dist = int(row.dist_od)
+        self.dist = row.dist
         self.auto_number = auto_number
         self.stream = stream
 
@@ -39,6 +53,7 @@ class Tube:  # pylint: disable=too-many-instance-attributes
         self.is_category_change = False
 
         self.seams = []
+        self._seam_orients = None
         self.lineobjects = []
         self.defects = []
         self.categories = []
@@ -69,7 +84,9 @@ class Tube:  # pylint: disable=too-many-instance-attributes
     def add_object(self, row):  # pylint: disable=too-complex
         """Add data to tube from csv row."""
         if row.is_defect:
-            self.defects.append(Defect(row, self))
+            defect = Defect(row, self)
+            defect.position = len(self.defects)
+            self.defects.append(defect)
 
         elif row.is_lineobj:
             self.lineobjects.append(row)
@@ -104,6 +121,11 @@ class Tube:  # pylint: disable=too-many-instance-attributes
         else:
             raise Error("Tube at dist {} has wrong row: {}".format(self.dist, str(row)))
 
+    def number_defects(self):
+        """Set positions of defects according current order of defects list."""
+        for i, defect in enumerate(self.defects):
+            defect.position = i
+
     def set_geo(self, latitude, longtitude, altitude):
         """Set geo coords for tube."""
         self.row.set_geo(latitude, longtitude, altitude)
@@ -189,10 +211,21 @@ class Tube:  # pylint: disable=too-many-instance-attributes
         if not self.seams:
             return TypeHorWeld.UNKNOWN
 
-        return int(self.seams[0].object_code)
+        return self.seams[0].num('object_code')
 
-    @property
-    def seam1(self):
+    def seam_orients(self):
+        """Return cached (seam1, seam2) orientations, that are parsed again only after change of seams data."""
+        key = None
+        if self.seams:
+            first, last = self.seams[0], self.seams[-1]
+            key = (len(self.seams) > 1, first.object_code_num, first.orient_td, first.orient_bd, last.orient_td)
+
+        if (self._seam_orients is None) or (self._seam_orients[0] != key):
+            self._seam_orients = (key, self._parse_seam1(), self._parse_seam2())
+
+        return self._seam_orients[1:]
+
+    def _parse_seam1(self):
         """Return orientation for longditual and spiral first pipe seam."""
         ornt = None
         if (len(self.seams) > 0) and (self.typ in [TypeHorWeld.HORIZONTAL, TypeHorWeld.SECOND, TypeHorWeld.SPIRAL]):
@@ -201,8 +234,7 @@ class Tube:  # pylint: disable=too-many-instance-attributes
 
         return ornt
 
-    @property
-    def seam2(self):
+    def _parse_seam2(self):
         """Return orientation for longditual and spiral second pipe seam."""
         ornt = None
         if (len(self.seams) > 0) and (self.typ == TypeHorWeld.SECOND):
@@ -214,6 +246,16 @@ class Tube:  # pylint: disable=too-many-instance-attributes
 
         return ornt
 
+    @property
+    def seam1(self):
+        """Return orientation for longditual and spiral first pipe seam."""
+        return self.seam_orients()[0]
+
+    @property
+    def seam2(self):
+        """Return orientation for longditual and spiral second pipe seam."""
+        return self.seam_orients()[1]
+
     @property
     def seam_info(self):
         """Return text string with seams orientation."""
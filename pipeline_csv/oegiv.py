@@ -148,6 +148,8 @@ SEAM = {
 class Row(row.Row):
     """Row of Deftable.csv file."""
 
+    __slots__ = ()
+
     @staticmethod
     def get_bool(val):
         """Bool value for IV csv."""
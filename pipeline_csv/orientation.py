@@ -5,13 +5,38 @@ CIRCLE_MINUTES = 720
 HOUR_MINUTES = int(CIRCLE_MINUTES / 12)
 CIRCLE_HOURS = int(CIRCLE_MINUTES / 60)
 
+# number of (hours, minutes) pairs with hours 0-12, key of pair is hours * HOUR_MINUTES + minutes
+KEYS_NUMBER = (CIRCLE_HOURS + 1) * HOUR_MINUTES
+
+# shortest distance in minutes for given clockwise distance
+CIRCLE_DIST = tuple(min(i, CIRCLE_MINUTES - i) for i in range(CIRCLE_MINUTES))
+
 
 class Error(Exception):
     """Orientation exception."""
 
 
+def csv_text(hours, minutes):
+    """Return orientation string in csv format for given hours and minutes."""
+    hours = int(hours)
+    if hours == 0:
+        hours = CIRCLE_HOURS
+
+    if minutes < 10:
+        minutes = '0{}'.format(minutes)
+
+    return "{},{}".format(hours, minutes)
+
+
 class Orientation:
-    """Orientation units conversions."""
+    """Orientation units conversions.
+
+    Factory methods (from_csv, from_minutes, ...) return shared immutable objects
+    from precomputed table, so orientation objects are not created on every call.
+    Use copy method or constructor to get changeable object.
+    """
+
+    __slots__ = ('hours', 'minutes', 'frozen')
 
     def __init__(self, hours, minutes):
         """Construct object from integer hours and minutes."""
@@ -21,20 +46,33 @@ class Orientation:
         if not (0 <= minutes <= (HOUR_MINUTES - 1)):
             raise Error("Wrong minutes: {}. Must be 0-59".format(minutes))
 
+        self.frozen = False
         self.hours = hours
         self.minutes = minutes
 
+    def __setattr__(self, name, value):
+        """Deny changes of shared objects."""
+        if getattr(self, 'frozen', False):
+            raise Error("Shared orientation {} can not be changed".format(self))
+        object.__setattr__(self, name, value)
+
+    def __reduce__(self):
+        """Unpickle shared objects as shared."""
+        if self.frozen:
+            return (shared_orientation, (self.hours, self.minutes))
+
+        return (self.__class__, (self.hours, self.minutes))
+
     def __str__(self):
         """Return orientation string in csv format."""
-        hours = int(self.hours)
-        if hours == 0:
-            hours = str(CIRCLE_HOURS)
+        if self.frozen:
+            return CSV_TEXT[self.hours * HOUR_MINUTES + self.minutes]
 
-        minutes = self.minutes
-        if minutes < 10:
-            minutes = '0{}'.format(minutes)
+        return csv_text(self.hours, self.minutes)
 
-        return "{},{}".format(hours, minutes)
+    def copy(self):
+        """Return changeable copy of object."""
+        return Orientation(self.hours, self.minutes)
 
     @property
     def as_minutes(self):
@@ -51,12 +89,12 @@ class Orientation:
         """Construct object from hours as float."""
         parttial_hour, hours = math.modf(hour_float)
         minutes = parttial_hour * HOUR_MINUTES
-        return cls(int(hours), int(minutes))
+        return shared_orientation(int(hours), int(minutes))
 
     @classmethod
     def from_minutes(cls, minutes):
         """Construct object from integer minutes."""
-        return cls(int(minutes / HOUR_MINUTES), minutes % HOUR_MINUTES)
+        return shared_orientation(int(minutes / HOUR_MINUTES), minutes % HOUR_MINUTES)
 
     @classmethod
     def from_degree(cls, degree):
@@ -66,30 +104,29 @@ class Orientation:
     @classmethod
     def from_csv(cls, text):
         """Construct object from from text 'hours,minites'."""
+        ornt = CSV_PARSE.get(text)
+        if ornt is not None:
+            return ornt
+
         if ',' not in text:
             return None
 
         hours, minutes = text.split(',')
-        return cls(int(hours), int(minutes))
+        return shared_orientation(int(hours), int(minutes))
 
     def dist_to_int(self, ornt):
         """Return two distances (clockwise and counterclock-wise) in angle minutes to given orientation object."""
-        clockwise = int(ornt.as_minutes - self.as_minutes)
-        if clockwise < 0:
-            clockwise = CIRCLE_MINUTES + clockwise
-
+        clockwise = int(ornt.as_minutes - self.as_minutes) % CIRCLE_MINUTES
         return (clockwise, (CIRCLE_MINUTES - clockwise) % CIRCLE_MINUTES)
 
     def dist_to(self, ornt):
         """Return distance in angle minutes to given orientation object."""
-        clockwise, counterclock_wise = self.dist_to_int(ornt)
-        return min([clockwise, counterclock_wise])
+        return CIRCLE_DIST[int(ornt.as_minutes - self.as_minutes) % CIRCLE_MINUTES]
 
     def is_inside(self, ornt1, ornt2):
         """Return True if orientation located inside given arc."""
-        arc, _ = ornt1.dist_to_int(ornt2)
-        dst, _ = self.dist_to_int(ornt2)
-        return dst <= arc
+        end = ornt2.as_minutes
+        return (end - self.as_minutes) % CIRCLE_MINUTES <= (end - ornt1.as_minutes) % CIRCLE_MINUTES
 
     def add_minutes(self, minutes):
         """Increases the orientation angle by a specified number of minutes. Returns the new minutes value."""
@@ -99,6 +136,31 @@ class Orientation:
         return self.as_minutes
 
 
+def make_shared(key):
+    """Return immutable orientation object for given key."""
+    ornt = Orientation(*divmod(key, HOUR_MINUTES))
+    ornt.frozen = True
+    return ornt
+
+
+SHARED = tuple(make_shared(key) for key in range(KEYS_NUMBER))
+CSV_TEXT = tuple(csv_text(*divmod(key, HOUR_MINUTES)) for key in range(KEYS_NUMBER))
+# csv texts 'h,mm' and 'h,m' for all shared objects
+CSV_PARSE = dict(
+  [(CSV_TEXT[ornt.hours * HOUR_MINUTES + ornt.minutes], ornt) for ornt in SHARED] +
+  [("{},{}".format(ornt.hours, ornt.minutes), ornt) for ornt in SHARED]
+)
+
+
+def shared_orientation(hours, minutes):
+    """Return shared immutable orientation object for given integer hours and minutes."""
+    if isinstance(hours, int) and isinstance(minutes, int) and (0 <= minutes < HOUR_MINUTES):
+        if 0 <= hours <= CIRCLE_HOURS:
+            return SHARED[hours * HOUR_MINUTES + minutes]
+
+    return Orientation(hours, minutes)
+
+
 def from_infotech_html(text):
     """Return orientation from infotech string."""
     return Orientation.from_hour_float(float(text.replace(',', '.')))
@@ -106,6 +168,70 @@ def from_infotech_html(text):
 
 def add180(ornt):
     """Return the orientation 180 degrees away from the given one."""
-    new_ornt = Orientation.from_minutes(ornt.as_minutes)
-    new_ornt.add_minutes(180 * 2)  # degree to minutes
-    return new_ornt
+    return Orientation.from_minutes((ornt.as_minutes + 180 * 2) % CIRCLE_MINUTES)  # degree to minutes
+
+
+# Functions for NumPy arrays of integer minutes (0-719), that require optional numpy package.
+# Negative values (csvfile.columns.NO_ORIENT) mean missed orientation.
+
+
+def clockwise_array(start, end):
+    """Return array of clockwise distances in minutes from start to end, see Orientation.dist_to_int."""
+    import numpy as np
+
+    return (np.asarray(end) - np.asarray(start)) % CIRCLE_MINUTES
+
+
+def dist_array(start, end):
+    """Return array of shortest distances in minutes between start and end, see Orientation.dist_to."""
+    import numpy as np
+
+    clockwise = clockwise_array(start, end)
+    return np.minimum(clockwise, CIRCLE_MINUTES - clockwise)
+
+
+def inside_array(minutes, arc_start, arc_end):
+    """Return boolean array, True if minutes located inside arcs, see Orientation.is_inside."""
+    return clockwise_array(minutes, arc_end) <= clockwise_array(arc_start, arc_end)
+
+
+def middle_array(start, end):
+    """Return array of middle points for clockwise arcs from start to end, see Defect.orientation_point."""
+    import numpy as np
+
+    return (np.asarray(start) + clockwise_array(start, end) // 2) % CIRCLE_MINUTES
+
+
+def hours_array(minutes):
+    """Return array of nearest clock hours (0-11) for minutes, see statistics.defects.get_hour."""
+    import numpy as np
+
+    minutes = np.asarray(minutes)
+    return (minutes // HOUR_MINUTES + (minutes % HOUR_MINUTES > HOUR_MINUTES // 2)) % CIRCLE_HOURS
+
+
+def hours_histogram(starts, ends=None):
+    """Return array of 12 counters of segments by clock hours, see statistics.defects.at_hours.
+
+    Segments with negative start are skipped, segments with negative end count only start hour.
+    """
+    import numpy as np
+
+    starts = np.asarray(starts)
+    present = starts >= 0
+    starts = starts[present]
+    first = hours_array(starts)
+    number = np.ones(len(starts), dtype=np.int64)
+
+    if ends is not None:
+        ends = np.asarray(ends)[present]
+        with_end = ends >= 0
+        number[with_end] = (hours_array(ends[with_end]) - first[with_end]) % CIRCLE_HOURS + 1
+
+    # difference array for two turns of circle
+    bounds = np.bincount(first, minlength=2 * CIRCLE_HOURS + 1) - np.bincount(
+      first + number, minlength=2 * CIRCLE_HOURS + 1
+    )
+    counts = np.cumsum(bounds)
+
+    return counts[:CIRCLE_HOURS] + counts[CIRCLE_HOURS:2 * CIRCLE_HOURS]
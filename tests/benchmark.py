@@ -0,0 +1,89 @@
+"""Benchmarks for big synthetic csv files.
+
+make bench B=dist_unique
+make bench B=to_file
+make bench B=totals
+"""
+import sys
+import time
+
+
+def timing(func, *args):
+    """Return seconds spent for func call."""
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def report(name, rows, seconds):
+    """Print benchmark results."""
+    print("{} rows: {} time: {:.3f} sec rows/sec: {:.0f}".format(name, rows, seconds, rows / seconds))
+
+
+def dist_unique():
+    """File.make_distances_unique on tables with 100 duplicates for every distance."""
+    from pipeline_csv.csvfile import File
+    from pipeline_csv.csvfile.row import Row
+
+    for rows in [250000, 500000, 1000000]:
+        csv_file = File()
+        csv_file.data = [Row.as_weld(i // 100) for i in range(rows)]
+        report('dist_unique', rows, timing(csv_file.make_distances_unique))
+
+
+def to_file():
+    """File.to_file for tables with defects for both float delimiters."""
+    import os
+    import tempfile
+    from pipeline_csv import DefektSide
+    from pipeline_csv.csvfile import File, FloatDelimiter
+    from pipeline_csv.oegiv import Row, TypeDefekt
+
+    rows = 500000
+    for delimiter in [FloatDelimiter.Point, FloatDelimiter.Comma]:
+        csv_file = File(float_delimiter=delimiter)
+        csv_file.data = [
+          Row.as_defekt(i, TypeDefekt.CORROZ, DefektSide.INSIDE, '10', '10', '15', '', '', '', '', 'comment')
+          for i in range(rows)
+        ]
+        for row in csv_file.data:
+            row.depth_max = 15.5
+        with tempfile.TemporaryDirectory() as folder:
+            name = "to_file '{}'".format(delimiter)
+            report(name, rows, timing(csv_file.to_file, os.path.join(folder, 'bench.csv')))
+
+
+def totals():
+    """Statistics Totals.fill and Totals.fill_parallel for table with 10 defects on every tube."""
+    import os
+    from pipeline_csv import DefektSide
+    from pipeline_csv.csvfile.statistics.totals import Totals
+    from pipeline_csv.oegiv import File, Row, TypeDefekt
+
+    rows = 330000
+    csv_file = File(1400)
+    csv_file.data += [
+      Row.as_weld(i) if not i % 11 else
+      Row.as_defekt(i, TypeDefekt.CORROZ, DefektSide.INSIDE, '10', '10', '15', '1,00', '2,00', '', '', '')
+      for i in range(rows)
+    ]
+    report('totals fill', rows, timing(Totals().fill, csv_file, None))
+    workers = max(os.cpu_count(), 2)
+    report('totals fill_parallel {}'.format(workers), rows, timing(Totals().fill_parallel, csv_file, None, workers))
+
+
+BENCHMARKS = {
+  'dist_unique': dist_unique,
+  'to_file': to_file,
+  'totals': totals,
+}
+
+
+def main(names):
+    """Run benchmarks with given names or all benchmarks."""
+    for name in names or sorted(BENCHMARKS.keys()):
+        BENCHMARKS[name]()
+
+
+if __name__ == '__main__':  # pragma: no cover
+    main(sys.argv[1:])
@@ -0,0 +1,131 @@
+"""Tests columns.py file.
+
+make test T=test_csv/test_columns.py
+"""
+import pytest
+from . import TestCsv
+
+np = pytest.importorskip("numpy")
+
+
+class TestColumns(TestCsv):
+    """Check columns.py file."""
+
+    def test_to_columns(self):
+        """Check File.to_columns."""
+        from pipeline_csv.oegiv import File
+
+        csv_file = File.from_file(self.fixture('DefTable.csv'), 1400)
+        table = csv_file.to_columns()
+
+        assert len(table) == len(csv_file.data)
+        assert table.dist_od.dtype == np.int64
+        assert list(np.diff(table.dist_od) >= 0) == [True] * (len(table) - 1)
+
+        for name in ['is_weld', 'is_defect', 'is_lineobj', 'is_seam', 'is_thick', 'is_category', 'is_diam']:
+            rows = table.select(getattr(table, name))
+            assert rows
+            assert rows == [row for row in table.rows if getattr(row, name)]
+
+        assert table.select(table.is_marker) == [row for row in table.rows if row.is_marker]
+
+        defects = table.select(table.is_defect)
+        assert list(table.orient_td[table.is_defect]) == [
+          -1 if row.orient1 is None else row.orient1 for row in defects
+        ]
+        assert np.isnan(table.depth_max[table.is_weld]).all()
+
+    def test_queries(self):
+        """Check queries by masks."""
+        from pipeline_csv import DefektSide
+        from pipeline_csv.csvfile.columns import ColumnTable
+        from pipeline_csv.oegiv import File, Row, TypeDefekt, TypeMarker
+
+        csv_file = File()
+        csv_file.data = [
+          Row.as_weld(0),
+          Row.as_lineobj(100, TypeMarker.VALVE, 'valve1', True, ''),
+          Row.as_defekt(
+            200, TypeDefekt.CORROZ, DefektSide.INSIDE, '10', '10', '45', None, None, None, None, ''
+          ),
+          Row.as_weld(1000),
+          Row.as_defekt(
+            1200, TypeDefekt.CORROZ, DefektSide.INSIDE, '10', '10', '30', None, None, None, None, ''
+          ),
+          Row.as_weld(2000),
+          Row.as_lineobj(2100, TypeMarker.VALVE, 'valve2', True, ''),
+          Row.as_weld(3000),
+        ]
+        table = csv_file.to_columns()
+
+        deep = table.select(table.is_defect & (table.depth_max > 40))
+        assert [row.dist for row in deep] == [200]
+
+        valves = table.dist_od[table.is_valve]
+        assert list(valves) == [100, 2100]
+
+        welds = table.select(table.is_weld & table.between(valves[0], valves[1]))
+        assert [row.dist for row in welds] == [1000, 2000]
+
+        assert (table.is_lineobj & table.with_codes([TypeMarker.VALVE])).sum() == 2
+
+        table = ColumnTable([])
+        assert len(table) == 0
+        assert not table.select(table.is_valve)
+
+    def test_dist_modify(self):
+        """Check batch mode of File.dist_modify."""
+        from pipeline_csv import Error
+        from pipeline_csv.csvfile.row import Row
+        from pipeline_csv.oegiv import File
+
+        fname = self.fixture('infotech.csv')
+        table = File.load_dist_modify(self.fixture('dist_modifi.csv'))
+        etalon = File.from_file(fname, 1400)
+        etalon.dist_modify(table)
+
+        csv_file = File.from_file(fname, 1400)
+        csv_file.dist_modify(table, batch=True)
+
+        assert csv_file.data[-1].dist_od == 130889155
+        for row, expected in zip(csv_file.data, etalon.data):
+            assert row.values() == expected.values()
+
+        table = [[10, 10], [50, 25], [100, 100]]
+        dists = [20, 10, 50, 30, 70, 100, 150, 55, 51]
+        etalon = File()
+        etalon.data = [Row.as_weld(dist) for dist in dists]
+        etalon.dist_modify(table)
+
+        csv_file = File()
+        csv_file.data = [Row.as_weld(dist) for dist in dists]
+        csv_file.dist_modify(table, batch=True)
+        assert [row.dist_od for row in csv_file.data] == [row.dist_od for row in etalon.data]
+
+        csv_file.data = [Row.as_thick(0, 105)]
+        with pytest.raises(Error) as err:
+            csv_file.dist_modify(table, batch=True)
+        assert 'dist 0 < node 10' in str(err.value)
+
+        csv_file.data = []
+        csv_file.dist_modify(table, batch=True)
+
+    @staticmethod
+    def test_one_node_table():
+        """Dist modifications table with one node."""
+        from pipeline_csv import Error
+        from pipeline_csv.csvfile.row import Row
+        from pipeline_csv.csvfile.columns import transform_dists
+        from pipeline_csv.oegiv import File
+
+        with pytest.raises(Error) as err:
+            transform_dists([10, 20, 30], [[10, 15]])
+        assert 'at least two nodes' in str(err.value)
+
+        csv_file = File()
+        csv_file.data = [Row.as_weld(dist) for dist in [10, 20, 30]]
+        for batch in (False, True):
+            with pytest.raises(Error) as err:
+                csv_file.dist_modify([[10, 15]], batch=batch)
+            assert 'at least two nodes' in str(err.value)
+        assert [row.dist for row in csv_file.data] == [10, 20, 30]
@@ -181,6 +181,62 @@ class TestDefect(TestCsv):
         defect.row.length = ''
         assert defect.length == 0
 
+    def test_number_at_pipe(self):
+        """Defect numbers at pipe after add, sort and remove of defects."""
+        from pipeline_csv import DefektSide
+        from pipeline_csv.oegiv import TypeDefekt, Row
+
+        for dist in [50, 30, 40]:
+            self.pipe.add_object(Row.as_defekt(
+              dist, TypeDefekt.CORROZ, DefektSide.INSIDE, '10', '10', '15', '', '', '', '', ''
+            ))
+
+        defects = list(self.pipe.defects)
+        assert [defect.position for defect in defects] == [0, 1, 2]
+        assert [defect.number_at_pipe for defect in defects] == [1, 2, 3]
+
+        self.pipe.defects.sort(key=lambda defect: defect.row.dist)
+        assert [defect.number_at_pipe for defect in defects] == [3, 1, 2]
+
+        self.pipe.defects.remove(defects[1])
+        assert [defect.number_at_pipe for defect in self.pipe.defects] == [1, 2]
+        with self.assertRaises(ValueError):
+            assert defects[1].number_at_pipe
+
+        self.pipe.defects.insert(0, defects[1])
+        assert defects[1].number_at_pipe == 1
+        assert defects[0].number_at_pipe == 3
+
+    def test_orient_cache(self):
+        """Orientations are parsed on first access and after change of row text."""
+        from pipeline_csv import TypeHorWeld
+        from pipeline_csv.oegiv import Row
+        from pipeline_csv.orientation import Orientation
+
+        defect = self.make_defect(10, 10, Orientation(9, 10), Orientation(5, 10), Orientation(11, 0), 11)
+        orient1, orient_mp = defect.orient1, defect.orient_mp
+        assert defect.orient1 is orient1
+        assert defect.orient_mp is orient_mp
+        assert defect.orientation_point is orient_mp
+        assert defect.orient2.as_minutes == 310
+
+        defect.row.orient_bd = '6,00'
+        assert defect.orient2.as_minutes == 360
+        defect.row.orient_td = ''
+        assert defect.orient1 is None
+
+        defect.orient1 = Orientation(1, 0)
+        assert defect.orient1.as_minutes == 60
+
+        assert self.pipe.seam1 is None
+        self.pipe.add_object(Row.as_seam(self.pipe.dist + 1, TypeHorWeld.SECOND, '2,0', '8,0'))
+        seam1 = self.pipe.seam1
+        assert self.pipe.seam1 is seam1
+        assert self.pipe.seam2.as_minutes == 480
+
+        self.pipe.seams[0].orient_bd = '7,00'
+        assert self.pipe.seam2.as_minutes == 420
+
     def test_no_orient(self):
         """Check defekt without orientations."""
         from pipeline_csv import TypeHorWeld
@@ -274,3 +330,31 @@ class TestDefect(TestCsv):
 
         defect = self.make_defect(11, 10, None, None, None, 11)
         assert defect.orientation_point is None
+
+    def test_malformed(self):
+        """Check properties for malformed numeric fields."""
+        import pytest
+        from pipeline_csv.orientation import Orientation
+
+        self.pipe.thick_mm = 10
+        defect = self.make_defect(11, 10, Orientation(8, 0), Orientation(9, 0), None, 11)
+
+        defect.row.depth_max = '10,5'
+        with pytest.raises(ValueError):
+            assert defect.depth_percent
+        with pytest.raises(ValueError):
+            assert defect.depth_mm
+
+        defect.row.depth_max = ''
+        assert defect.depth_percent is None
+        assert defect.depth_mm is None
+
+        defect.row.length = 'abc'
+        with pytest.raises(ValueError):
+            assert defect.length
+        defect.row.length = ''
+        assert defect.length == 0
+
+        defect.row.width = 'abc'
+        with pytest.raises(ValueError):
+            assert defect.width
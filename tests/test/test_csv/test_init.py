@@ -39,6 +39,67 @@ class TestInit(TestCsv):  # pylint: disable=too-many-public-methods
         assert format_floats(data, FloatDelimiter.Point) == data
         assert format_floats(data, FloatDelimiter.Comma) == [1, '2', '3,0']
 
+    def test_to_file_comma(self):
+        """Save file with comma float delimiter."""
+        from pipeline_csv.csvfile import File, FloatDelimiter, comma_floats
+        from pipeline_csv.csvfile.row import Row
+
+        data = ('1', 2, None, True)
+        assert comma_floats(FloatDelimiter.Comma)(data) is data
+        assert comma_floats(FloatDelimiter.Comma)(data + (1.5,)) == ['1', 2, None, True, '1,5']
+
+        csv_file = File(1400, float_delimiter=FloatDelimiter.Comma)
+        csv_file.data = [Row.as_weld(10), Row.as_thick(10, 105), Row.as_weld(1000)]
+        csv_file.data[1].depth_max = 10.5
+        csv_file.data[2].depth_max = '10.5'
+        fname = self.build('comma.csv')
+        csv_file.to_file(fname)
+
+        with open(fname, encoding=File.ENCODING) as inp:
+            lines = inp.read().splitlines()
+        assert len(lines) == 4
+        assert lines[0] == ';'.join(File.COLUMN_HEADS)
+        assert ';10,5;' in lines[2]
+        assert ';10.5;' in lines[3]
+        assert lines[1] == ';'.join(str(i) for i in Row.as_weld(10).values())
+
+    def test_to_file_hooks(self):
+        """Save file with overridden Row.values and File.check_id_unique."""
+        from pipeline_csv.csvfile import File
+        from pipeline_csv.csvfile.row import Row
+
+        class CustomRow(Row):
+            """Row with custom values."""
+
+            __slots__ = ()
+
+            def values(self):
+                """Return values with custom comment."""
+                result = super().values()
+                result[-1] = 'custom'
+                return result
+
+        class CustomFile(File):
+            """File with custom ID check."""
+
+            checked = []
+
+            def check_id_unique(self, row):
+                """Remember checked rows."""
+                self.checked.append(row.dist)
+
+        csv_file = CustomFile()
+        csv_file.data = [CustomRow.as_weld(10), Row.as_weld(1000)]
+        csv_file.data[0].obj_id = csv_file.data[1].obj_id = 'same'
+        fname = self.build('hooks.csv')
+        csv_file.to_file(fname)
+        assert CustomFile.checked == [10, 1000]
+
+        with open(fname, encoding=File.ENCODING) as inp:
+            lines = inp.read().splitlines()
+        assert lines[1].endswith(';custom')
+        assert not lines[2].endswith(';custom')
+
     def test_get_tubes(self):
         """Check get_tubes."""
         from pipeline_csv import TypeHorWeld
@@ -71,6 +132,224 @@ class TestInit(TestCsv):  # pylint: disable=too-many-public-methods
         assert tube.dist == 416088
         assert len(warns) == 1
 
+    def test_iter_rows(self):
+        """Check iter_rows."""
+        from pipeline_csv import Error
+        from pipeline_csv.oegiv import File
+
+        fname = self.fixture('DefTable.csv')
+        rows = list(File.iter_rows(fname))
+        assert len(rows) == 178
+        assert [row.dist_od for row in rows] == [row.dist_od for row in File.from_file(fname).data]
+
+        fname = self.build('unsorted.csv')
+        csv_file = File()
+        csv_file.data = [
+          File.RowCls.as_weld(1000),
+          File.RowCls.as_weld(10),
+        ]
+        csv_file.to_file(fname)
+        with open(fname, 'a', encoding=File.ENCODING) as out:
+            out.write('5;0;0;;;;;;;;;;;;;;;;;;;;;;;;\n')
+
+        with pytest.raises(Error) as err:
+            list(File.iter_rows(fname))
+        assert 'Unsorted dist 5 after 1000' in str(err.value)
+
+        os.remove(fname)
+
+    def test_iter_tubes(self):
+        """Check iter_tubes."""
+        from pipeline_csv import Error
+        from pipeline_csv.oegiv import File, Row
+
+        fname = self.fixture('DefTable.csv')
+        warns = []
+        tubes = list(File.iter_tubes(fname, 1400, warns))
+        expected = list(File.from_file(fname, 1400).get_tubes())
+
+        assert not warns
+        assert len(tubes) == len(expected)
+        for tube, etalon in zip(tubes, expected):
+            assert tube.dist == etalon.dist
+            assert tube.length == etalon.length
+            assert tube.number == etalon.number
+            assert tube.thick == etalon.thick
+            assert tube.category == etalon.category
+            assert tube.diameter == etalon.diameter
+            assert len(tube.defects) == len(etalon.defects)
+            assert len(tube.lineobjects) == len(etalon.lineobjects)
+
+        assert not File.iter_tubes(self.fixture('no_welds.csv'))
+
+        with pytest.raises(Error) as err:
+            list(File.iter_tubes(self.fixture('dup_ids.csv')))
+        assert 'Duplicate object ID' in str(err.value)
+
+        csv_file = File()
+        rows = [Row.as_weld(10), Row.as_weld(100), Row.as_weld(200)]
+        rows[0].obj_id = rows[2].obj_id = 'W1'
+        assert [i.dist for i in csv_file.tube_unique_rows(rows)] == [10, 100, 200]
+        assert not csv_file.ids - {'W1'}
+
+        rows = [Row.as_weld(10), Row.as_thick(20, 100), Row.as_thick(30, 90)]
+        rows[1].obj_id = rows[2].obj_id = 'T1'
+        with pytest.raises(Error) as err:
+            list(csv_file.tube_unique_rows(rows))
+        assert 'Duplicate object ID' in str(err.value)
+
+    def test_sorted_index(self):
+        """Check cached index with sorted rows."""
+        from pipeline_csv.oegiv import File, Row
+
+        csv_file = File.from_file(self.fixture('DefTable.csv'), 1400)
+        index = csv_file.sorted_index()
+        assert csv_file.sorted_index() is index
+        assert csv_file.sorted_data() == index.rows
+        assert len(index.rows) == len(csv_file.data)
+        assert [row.dist for row in index.rows] == sorted(row.dist for row in csv_file.data)
+        assert [index.rows[i] for i in index.welds] == [row for row in index.rows if row.is_weld]
+
+        csv_file.data.append(Row.as_weld(500000))
+        assert csv_file.sorted_index() is not index
+        assert csv_file.sorted_data()[-1].dist == 500000
+
+        index = csv_file.sorted_index()
+        csv_file.data = list(reversed(csv_file.data))
+        assert csv_file.sorted_index() is not index
+
+        index = csv_file.sorted_index()
+        csv_file.reverse()
+        assert csv_file.sorted_index() is not index
+        assert [row.dist for row in csv_file.sorted_data()] == sorted(row.dist for row in csv_file.data)
+
+        index = csv_file.sorted_index()
+        start = index.rows[0].dist
+        csv_file.dist_modify([[start, start], [start + 100, start + 200]])
+        assert csv_file.sorted_index() is not index
+
+        index = csv_file.sorted_index()
+        assert csv_file.make_distances_unique() == 0
+        assert csv_file.sorted_index() is index
+
+        csv_file.invalidate()
+        assert csv_file.sorted_index() is not index
+
+    def test_inplace_changes(self):
+        """Rows, changed inplace after index was built, are saved and divided to tubes."""
+        from pipeline_csv.oegiv import File, Row
+
+        csv_file = File.from_file(self.fixture('DefTable.csv'), 1400)
+        tubes_number = len(list(csv_file.get_tubes()))
+        assert csv_file.sorted_index()
+
+        csv_file.data[5] = Row.as_weld(12345)
+        csv_file.data[0].dist_od = '999999999'
+        fname = self.build('inplace.csv')
+        csv_file.to_file(fname)
+
+        saved = File.from_file(fname)
+        assert len(saved.data) == len(csv_file.data)
+        assert 12345 in [row.dist for row in saved.data if row.is_weld]
+        assert saved.data[-1].dist == 999999999
+        assert [row.dist for row in saved.data] == sorted(row.dist for row in saved.data)
+
+        tubes = list(csv_file.get_tubes())
+        assert len(tubes) == tubes_number + 1
+        assert 12345 in [tube.dist for tube in tubes]
+
+    def test_objects_between(self):
+        """Query rows by distance range."""
+        from pipeline_csv import ObjectClass
+        from pipeline_csv.oegiv import File
+
+        csv_file = File.from_file(self.fixture('infotech.csv'), 1400)
+        rows = csv_file.sorted_data()
+        start, end = rows[1000].dist, rows[2000].dist
+
+        assert csv_file.objects_between(start, end) == [row for row in rows if start <= row.dist <= end]
+        assert not csv_file.objects_between(end, start)
+
+        kinds = [ObjectClass.WELD, ObjectClass.DEFEKT]
+        assert csv_file.objects_between(start, end, kinds=kinds) == [
+          row for row in rows if (start <= row.dist <= end) and row.type_object_num in kinds
+        ]
+        assert not csv_file.objects_between(start, end, kinds=[999])
+
+    def test_nearest(self):
+        """Nearest row of given type."""
+        from pipeline_csv import ObjectClass
+        from pipeline_csv.oegiv import File
+
+        csv_file = File.from_file(self.fixture('infotech.csv'), 1400)
+        welds = [row for row in csv_file.sorted_data() if row.is_weld]
+
+        assert csv_file.nearest(-100, ObjectClass.WELD) is welds[0]
+        assert csv_file.nearest(welds[-1].dist + 100, ObjectClass.WELD) is welds[-1]
+        assert csv_file.nearest(welds[10].dist, ObjectClass.WELD) is welds[10]
+        assert csv_file.nearest(welds[10].dist + 1, ObjectClass.WELD) is welds[10]
+        assert csv_file.nearest(welds[11].dist - 1, ObjectClass.WELD) is welds[11]
+        middle = (welds[10].dist + welds[11].dist) / 2
+        assert csv_file.nearest(middle, ObjectClass.WELD) is welds[10]
+        assert csv_file.nearest(0, 999) is None
+
+    def test_annotate_defects(self):
+        """Nearest markers and valves for defects."""
+        from pipeline_csv.oegiv import File
+
+        csv_file = File.from_file(self.fixture('infotech.csv'), 1400)
+        defects = [defect for tube in csv_file.get_tubes() for defect in tube.defects]
+        assert defects[0].marker_up is None
+        assert defects[0].to_marker_up is None
+
+        csv_file.annotate_defects(reversed(defects))
+        markers = [row for row in csv_file.sorted_data() if row.is_marker]
+        valves = [row for row in csv_file.sorted_data() if row.is_valve]
+        assert markers
+        assert valves
+
+        for defect in defects:
+            dist = defect.row.dist
+            for references, upstream, downstream in [
+              (markers, defect.marker_up, defect.marker_down),
+              (valves, defect.valve_up, defect.valve_down),
+            ]:
+                assert upstream is ([None] + [row for row in references if row.dist <= dist])[-1]
+                assert downstream is ([row for row in references if row.dist > dist] + [None])[0]
+
+            if defect.marker_up:
+                assert defect.to_marker_up == dist - defect.marker_up.dist
+            if defect.valve_down:
+                assert defect.to_valve_down == defect.valve_down.dist - dist
+
+    def test_tube_at(self):
+        """Tube, that contain given distance."""
+        from pipeline_csv.oegiv import File
+
+        csv_file = File.from_file(self.fixture('infotech.csv'), 1400)
+        tubes = list(csv_file.get_tubes())
+
+        for tube in [tubes[0], tubes[1], tubes[100], tubes[5000], tubes[-1]]:
+            for dist in [tube.dist, tube.dist + tube.length - 1]:
+                found = csv_file.tube_at(dist)
+                assert found.dist == tube.dist
+                assert found.length == tube.length
+                assert found.auto_number == tube.auto_number
+                assert found.thick == tube.thick
+                assert found.diameter == tube.diameter
+                assert found.category == tube.category
+                assert found.is_thick_change == tube.is_thick_change
+                assert len(found.defects) == len(tube.defects)
+
+        assert csv_file.tube_at(tubes[0].dist - 1) is None
+        assert csv_file.tube_at(tubes[-1].dist + tubes[-1].length) is None
+
+        # calls inside get_tubes loop do not change stream state of iterated tubes
+        last = tubes[-1].dist
+        for tube, expected in zip(csv_file.get_tubes(), tubes):
+            assert csv_file.tube_at(last).dist == last
+            assert (tube.thick, tube.category, tube.diameter) == (expected.thick, expected.category, expected.diameter)
+
     @staticmethod
     def check_objects(objects, val_list):
         """Check compare objrcts list with expected values."""
@@ -212,6 +491,75 @@ class TestInit(TestCsv):  # pylint: disable=too-many-public-methods
         assert len(csv_file.data) == (179 * 2 + 1)
         assert csv_file.total_length == (426625 * 2 + 11000)
 
+    def test_join_workers(self):
+        """Check join with files loaded by process pool."""
+        from pipeline_csv.oegiv import File
+
+        names = ['11000', self.fixture('DefTable.csv'), 500, self.fixture('1.csv'), self.fixture('DefTable.csv')]
+        etalon = File.from_file(self.fixture('1.csv'), 1400)
+        etalon.join(names)
+
+        csv_file = File.from_file(self.fixture('1.csv'), 1400)
+        csv_file.join(names, workers=2)
+
+        assert len(csv_file.data) == len(etalon.data)
+        assert csv_file.total_length == etalon.total_length
+        for row, expected in zip(csv_file.data, etalon.data):
+            assert row.values() == expected.values()
+
+        assert len(set(id(row) for row in csv_file.data)) == len(csv_file.data)
+
+    def test_from_file_cache(self):
+        """Load file with binary cache of parsed rows."""
+        import shutil
+        from pipeline_csv.oegiv import File
+        from pipeline_csv.csvfile.cache import cache_path
+
+        fname = self.build('cached.csv')
+        shutil.copyfile(self.fixture('DefTable.csv'), fname)
+        if os.path.exists(cache_path(fname)):
+            os.remove(cache_path(fname))
+
+        etalon = File.from_file(fname, 1400)
+        for _ in range(2):
+            csv_file = File.from_file(fname, 1400, cache=True)
+            assert os.path.exists(cache_path(fname))
+            assert [row.__getstate__() for row in csv_file.data] == [row.__getstate__() for row in etalon.data]
+            assert csv_file.ids == etalon.ids
+            assert len(csv_file.thicks) == len(etalon.thicks)
+            assert len(csv_file.categories) == len(etalon.categories)
+            assert len(csv_file.diameters) == len(etalon.diameters)
+
+        with open(fname, 'a', encoding=File.ENCODING) as out:
+            out.write('999999;0;;;;;;;;;;;;;;;;;;;;;;;;;\n')
+        assert File.from_file(fname, 1400, cache=True).data[-1].dist == 999999
+        assert File.from_file(fname, 1400, cache=True).data[-1].dist == 999999
+
+        with open(cache_path(fname), 'wb') as out:
+            out.write(b'xxx')
+        assert len(File.from_file(fname, 1400, cache=True).data) == len(etalon.data) + 1
+
+    def test_save_rows(self):
+        """Cache is saved by unique temporary file."""
+        import shutil
+        from pipeline_csv.oegiv import File
+        from pipeline_csv.csvfile.cache import file_key, save_rows, load_rows, cache_path
+
+        folder = self.build('cache_save')
+        shutil.rmtree(folder, ignore_errors=True)
+        os.makedirs(folder)
+        fname = os.path.join(folder, 'rows.csv')
+        shutil.copyfile(self.fixture('1.csv'), fname)
+        rows = list(File.read_rows(fname))
+        key = file_key(fname, File.RowCls)
+
+        assert save_rows(fname, key, rows)
+        assert save_rows(fname, key, rows)
+        assert sorted(os.listdir(folder)) == ['rows.csv', os.path.basename(cache_path(fname))]
+        assert len(load_rows(fname, key)) == len(rows)
+
+        assert not save_rows(os.path.join(folder, 'missed', 'rows.csv'), key, rows)
+
     def test_join_short(self):
         """Check join short file."""
         from pipeline_csv.oegiv import File
@@ -361,6 +709,40 @@ class TestInit(TestCsv):  # pylint: disable=too-many-public-methods
         assert csv_file.data[0].dist_od == dist
         assert csv_file.data[-1].dist_od == dist + dist_shift_mm
 
+    @staticmethod
+    def test_make_distances_unique_random():
+        """Compare make_distances_unique with straightforward algorithm."""
+        import random
+        from pipeline_csv.csvfile import File
+        from pipeline_csv.csvfile.row import Row
+
+        def etalon(dists, dist_shift_mm):
+            """Return shift count and new distances."""
+            dist_list = []
+            shift_count = 0
+            for dist in dists:
+                while dist in dist_list:
+                    dist += dist_shift_mm
+                    shift_count += 1
+                dist_list.append(dist)
+
+            return shift_count, dist_list
+
+        rnd = random.Random(1)
+        for dist_shift_mm in [1, 2, 3]:
+            dists = [rnd.randint(0, 100) for _ in range(300)]
+            csv_file = File()
+            csv_file.data = [Row.as_weld(dist) for dist in dists]
+            shift_count, new_dists = etalon(dists, dist_shift_mm)
+
+            assert csv_file.make_distances_unique(dist_shift_mm=dist_shift_mm) == shift_count
+            assert [row.dist for row in csv_file.data] == new_dists
+
+        csv_file = File()
+        csv_file.data = [Row.as_weld(i // 100) for i in range(100000)]
+        assert csv_file.make_distances_unique() > 0
+        assert len(set(row.dist for row in csv_file.data)) == len(csv_file.data)
+
     def test_add_warn(self):
         """Check add_warn method."""
         from pipeline_csv.csvfile import File
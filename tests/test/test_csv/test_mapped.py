@@ -0,0 +1,116 @@
+"""Tests mapped.py file.
+
+make test T=test_csv/test_mapped.py
+"""
+import pytest
+from . import TestCsv
+
+
+def tube_key(tube):
+    """Return tuple of tube properties for compare."""
+    return (
+      tube.dist, tube.length, tube.thick, tube.diameter, tube.category, tube.auto_number,
+      len(tube.defects), len(tube.lineobjects), len(tube.seams),
+      tube.is_thick_change, tube.is_diameter_change, tube.is_category_change,
+    )
+
+
+class TestMapped(TestCsv):
+    """Check mapped.py file."""
+
+    def test_rows(self):
+        """Rows of memory mapped file."""
+        from pipeline_csv.oegiv import File
+
+        csv_file = File.from_file(self.fixture('DefTable.csv'))
+        with File.map_file(self.fixture('DefTable.csv')) as mapped:
+            assert len(mapped) == len(csv_file.data)
+            assert list(mapped.dists) == [row.dist for row in csv_file.data]
+            assert [row.values() for row in mapped.rows()] == [row.values() for row in csv_file.data]
+            assert [row.values() for row in mapped.rows(5, 7)] == [row.values() for row in csv_file.data[5:7]]
+            assert not list(mapped.rows(7, 5))
+
+            start, end = 6924, 100000
+            assert [row.values() for row in mapped.between(start, end)] == [
+              row.values() for row in csv_file.data if start <= row.dist <= end
+            ]
+            assert not mapped.between(-20, -10)
+
+    def test_tubes_between(self):
+        """Tubes between distances from memory mapped file."""
+        from pipeline_csv.oegiv import File
+
+        csv_file = File.from_file(self.fixture('infotech.csv'), 1400)
+        tubes = list(csv_file.get_tubes())
+        mapped = File.map_file(self.fixture('infotech.csv'))
+
+        for first, last in [(0, 10), (1, 100), (5000, 5100), (len(tubes) - 20, len(tubes) - 1)]:
+            start, end = tubes[first].dist, tubes[last].dist
+            assert [tube_key(i) for i in mapped.tubes_between(start, end, 1400)] == [
+              tube_key(i) for i in tubes[first:last + 1]
+            ]
+            assert [tube_key(i) for i in mapped.tubes_between(start + 1, end - 1, 1400)] == [
+              tube_key(i) for i in tubes[first + 1:last]
+            ]
+
+        assert not mapped.tubes_between(tubes[-1].dist + 1, tubes[-1].dist + 10)
+        mapped.close()
+
+    def test_errors(self):
+        """Unsorted, wrong and empty files."""
+        from pipeline_csv import Error
+        from pipeline_csv.oegiv import File
+
+        fname = self.build('mapped.csv')
+        with open(fname, 'w', encoding=File.ENCODING) as out:
+            out.write(';'.join(File.COLUMN_HEADS) + '\n100;0;\n\n10;0;\n')
+        with pytest.raises(Error) as err:
+            File.map_file(fname)
+        assert 'Unsorted dist 10 after 100' in str(err.value)
+
+        with open(fname, 'w', encoding=File.ENCODING) as out:
+            out.write(';'.join(File.COLUMN_HEADS) + '\nxxx;0;\n')
+        with pytest.raises(Error) as err:
+            File.map_file(fname)
+        assert 'Wrong row at offset' in str(err.value)
+
+        with open(fname, 'w', encoding=File.ENCODING) as out:
+            out.write('')
+        with File.map_file(fname) as mapped:
+            assert not mapped
+            assert not mapped.between(0, 100)
+
+    def test_quoted(self):
+        """Rows with quoted multiline comments."""
+        from pipeline_csv.csvfile import File
+        from pipeline_csv.csvfile.row import Row
+
+        csv_file = File()
+        csv_file.data = [Row.as_weld(10), Row.as_weld(1000), Row.as_weld(2000)]
+        csv_file.data[1].comments = 'first;line\n"second" line'
+        fname = self.build('quoted.csv')
+        csv_file.to_file(fname)
+
+        with File.map_file(fname) as mapped:
+            assert list(mapped.dists) == [10, 1000, 2000]
+            assert mapped.between(1000, 1000)[0].comments == csv_file.data[1].comments
+            assert [i.length for i in mapped.tubes_between(0, 1000)] == [990, 1000]
+
+    def test_stream_before_weld(self):
+        """Stream rows before first weld are ignored."""
+        from pipeline_csv.csvfile import File
+        from pipeline_csv.csvfile.row import Row
+
+        csv_file = File(1400)
+        csv_file.data += [Row.as_thick(0, 105)] + [Row.as_weld(i) for i in [10, 1000, 2000, 3000, 4000, 5000]]
+        csv_file.data += [Row.as_thick(4500, 90)]
+        fname = self.build('stream.csv')
+        csv_file.to_file(fname)
+        tubes = list(File.from_file(fname, 1400).get_tubes())
+        assert [i.thick for i in tubes] == [None, None, None, None, 90]
+
+        with File.map_file(fname) as mapped:
+            assert [tube_key(i) for i in mapped.tubes_between(2000, 5000, 1400)] == [
+              tube_key(i) for i in tubes[2:]
+            ]
+            assert [tube_key(i) for i in mapped.tubes_between(5000, 5000, 1400)] == []
@@ -2,6 +2,7 @@
 
 make test T=test_csv/test_row.py
 """
+import pytest
 from . import TestCsv
 
 
@@ -225,6 +226,25 @@ class TestRow(TestCsv):
         row.reverse(10)
         assert row.comments == 'вправо'
 
+        row.comments = 'начало, влево'
+        row.reverse(10)
+        assert row.comments == 'конец, вправо'
+
+        row.reverse(10)
+        assert row.comments == 'начало, влево'
+
+    @staticmethod
+    def test_reverse_orient_table():
+        """Reversed orientations table."""
+        from pipeline_csv.csvfile.row import REVERSE_ORIENT, reverse_orient
+
+        assert len(REVERSE_ORIENT) == 13 * 60
+        assert reverse_orient('') == ''
+        assert reverse_orient('3,5') == '8,10'
+        for text, reversed_text in REVERSE_ORIENT.items():
+            assert reverse_orient(reverse_orient(reversed_text)) == reversed_text
+            assert reverse_orient(text) == reversed_text
+
     @staticmethod
     def test_dict_default():
         """Check row default methods."""
@@ -242,6 +262,30 @@ class TestRow(TestCsv):
         assert not Row.atseam_codes()
         assert not Row.valve_codes()
 
+    @staticmethod
+    def test_code_categories():
+        """Check cached categories of defect codes."""
+        from pipeline_csv.csvfile.row import Row as BaseRow, Category
+        from pipeline_csv.oegiv import Row, TypeDefekt, TypeMarker
+
+        assert not BaseRow.code_categories()
+        assert not BaseRow.valve_set()
+
+        table = Row.code_categories()
+        assert Row.code_categories() is table
+        assert table[TypeDefekt.CORROZ] == Category.METAL_LOSS
+        assert table[TypeDefekt.DENT] == Category.DENT
+        assert table[TypeDefekt.GWAN] == Category.AT_WELD
+        assert table[TypeDefekt.ANOMALY_HOR_WELD] == Category.AT_SEAM
+        assert TypeDefekt.MECHANIC not in table
+        for code, flags in table.items():
+            assert bool(flags & Category.METAL_LOSS) == (code in Row.mloss_codes())
+            assert bool(flags & Category.DENT) == (code in Row.dents_codes())
+
+        assert Row.valve_set() == frozenset([TypeMarker.VALVE])
+        assert Row.as_lineobj(10, TypeMarker.VALVE, 'xxx', True, 'yyy').is_valve
+        assert not Row.as_lineobj(10, TypeMarker.MARKER, 'xxx', True, 'yyy').is_valve
+
     @staticmethod
     def test_orient_minutes():
         """Check row orient1/orient2 properties."""
@@ -253,3 +297,115 @@ class TestRow(TestCsv):
 
         assert row.orient1 == 70
         assert row.orient2 is None
+
+    @staticmethod
+    def test_slots():
+        """Check rows without per instance dict."""
+        import pickle
+        from pipeline_csv.csvfile.row import Row
+        from pipeline_csv.oegiv import Row as RowIV
+
+        for cls in [Row, RowIV]:
+            row = cls.as_weld(10, obj_id='1')
+            assert not hasattr(row, '__dict__')
+            with pytest.raises(AttributeError):
+                row.unknown_field = 1
+
+            copy = pickle.loads(pickle.dumps(row))
+            assert copy.__class__ is cls
+            assert copy.values() == row.values()
+            assert copy.__getstate__() == row.__getstate__()
+
+    @staticmethod
+    def test_state():
+        """Pickle state of row subclass with own slots."""
+        import pickle
+        from copy import copy
+        from pipeline_csv.csvfile.row import Row, state_fields
+
+        class CustomRow(Row):
+            """Row with own slot."""
+
+            __slots__ = ('extra', )
+
+            def __init__(self):
+                """Create row with extra field."""
+                super().__init__()
+                self.extra = None
+
+        row = CustomRow.as_weld(10)
+        row.extra = 'xxx'
+        assert state_fields(CustomRow) == Row.__slots__ + ('extra', )
+
+        duplicate = copy(row)
+        assert duplicate.extra == 'xxx'
+        assert duplicate.values() == row.values()
+
+        class DictRow(Row):
+            """Row subclass without slots."""
+
+            def __init__(self):
+                """Create row with extra field in instance dict."""
+                super().__init__()
+                self.extra = None
+
+        row = DictRow.as_weld(10)
+        row.extra = 5
+        duplicate = copy(row)
+        assert duplicate.extra == 5
+        assert duplicate.values() == row.values()
+
+        row = Row.as_weld(20)
+        assert not hasattr(row, '__dict__')
+        assert pickle.loads(pickle.dumps(row)).values() == row.values()
+
+    @staticmethod
+    def test_num_fields():
+        """Check numeric fields, parsed from csv text."""
+        from pipeline_csv import ObjectClass
+        from pipeline_csv.csvfile.row import Row, NumField
+
+        row = Row()
+        assert row.dist_od is None
+        assert row.dist_od_num is None
+        assert row.object_code_num == 0
+        assert row.length == ''
+        assert row.length_num is None
+        assert isinstance(Row.dist_od, NumField)
+
+        values = ['1010', '2', '0', '', '', 'False', '20', '10', '15', '15.5', '4,00', '5,00', '4,30', '1015', '1']
+        row = Row.from_csv_row(values + [''] * 12)
+        assert row.values()[:5] == values[:5]
+        assert row.values()[6:15] == values[6:15]
+        assert row.dist_od_num == 1010
+        assert row.dist == 1010
+        assert row.type_object_num == ObjectClass.DEFEKT
+        assert row.is_defect
+        assert row.object_code_num == 0
+        assert row.length_num == 20
+        assert row.width_num == 10
+        assert row.depth_min_num == 15.0
+        assert row.depth_max_num == 15.5
+        assert row.mpoint_dist_num == 1015
+        assert row.type_def_num == 1
+
+        row.dist_od = 'xxx'
+        assert row.dist_od == 'xxx'
+        assert row.dist_od_num is None
+        with pytest.raises(ValueError):
+            assert row.dist
+
+        row.length = 'abc'
+        assert row.length_num is None
+        with pytest.raises(ValueError):
+            row.num('length')
+        row.length = ''
+        assert row.num('length') is None
+        row.length = '30'
+        assert row.num('length') == 30
+
+        row.dist_od = 100
+        assert row.dist == 100
+        row.dist_od += 1
+        assert row.dist_od == 101
+        assert row.dist == 101
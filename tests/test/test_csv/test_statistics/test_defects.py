@@ -11,6 +11,7 @@ class TestDefects(TestStatistics):
 
     def test_dist_stacked(self):
         """Test DistStacked class."""
+        from pipeline_csv import Error
         from pipeline_csv.csvfile.statistics.defects import DistStacked
 
         prop = DistStacked(0, 100, 10)
@@ -22,6 +23,10 @@ class TestDefects(TestStatistics):
 
         assert prop.get_node(10) == 10.0
 
+        with pytest.raises(Error) as err:
+            prop.merge(DistStacked(0, 100, 20))
+        assert 'different bars' in str(err.value)
+
     def test_property_code_counter(self):
         """Test PropertyCodeCounter class."""
         from pipeline_csv.csvfile.statistics.defects import PropertyCodeCounter
@@ -30,11 +35,27 @@ class TestDefects(TestStatistics):
         counter.add_code('xxx', 0, self.tube)
         assert 0 in counter.code2text
 
+        other = PropertyCodeCounter()
+        other.add_code('yyy', 1, self.tube)
+        other.add_code('xxx', 0, self.tube)
+        assert counter.merge(other) is counter
+        assert counter.number == 3
+        assert counter.data[0].number == 2
+        assert other.data[0].number == 1
+        assert counter.code2text == {0: 'xxx', 1: 'yyy'}
+        assert counter.tubes_all() == 1
+
     def test_grade_tube(self):
         """Test GradeTube class."""
-        from pipeline_csv.csvfile.statistics.defects import GradeTube
+        from pipeline_csv import Error
+        from pipeline_csv.csvfile.statistics.defects import GradeTube, Dents
+
         assert 'total_num: 0' in str(GradeTube())
 
+        with pytest.raises(Error) as err:
+            Dents().merge(Dents(grades=[5, 10]))
+        assert 'different grades' in str(err.value)
+
     def test_gradebase(self):
         """Test GradeBase class."""
         from pipeline_csv.csvfile.statistics.defects import GradeBase
@@ -60,6 +81,10 @@ class TestDefects(TestStatistics):
             grade.add_item(None, None, None)
         assert 'add_item' in str(err.value)
 
+        with pytest.raises(NotImplementedError) as err:
+            grade.merge(Grade())
+        assert 'merge_data' in str(err.value)
+
     @staticmethod
     def test_at_hours():
         """Check at_hours function."""
@@ -72,3 +97,115 @@ class TestDefects(TestStatistics):
         assert at_hours(120, 720) == [2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 0]
         assert at_hours(700, 120) == [0, 1, 2]
         assert at_hours(500, 120) == [8, 9, 10, 11, 0, 1, 2]
+
+    @staticmethod
+    def test_hours_at():
+        """Check cached hours_at function."""
+        from pipeline_csv.csvfile.statistics.defects import at_hours, hours_at
+
+        for start, end in [(702, 10), (-1, -1), (120, None), (120, 720), (500, 120)]:
+            assert hours_at(start, end) == tuple(at_hours(start, end))
+            assert hours_at(start, end) is hours_at(start, end)
+
+    @staticmethod
+    def test_grade_for():
+        """Test GradeBase.grade_for with unsorted grades."""
+        from pipeline_csv.csvfile.statistics.defects import GRADE_OVER_MAX, Dents
+
+        def linear(grades, val):
+            """Return grade by linear search."""
+            for grade in grades:
+                if float(val) < float(grade):
+                    return grade
+            return GRADE_OVER_MAX
+
+        for grades in [[], [10], [5, 10], ['5', 10.5, 20], [10, 5, 20, 20, 15, 30]]:
+            dents = Dents(grades=grades)
+            for val in [-1, 0, 4.99, 5, 7, 10, 10.5, 14, 15, 19, 20, 25, 30, 31, float('nan')]:
+                assert dents.grade_for(float(val)) == linear(grades, val)
+
+        dents = Dents(grades=[5, 10, 3])
+        assert dents.bounds == [5.0, 10.0, 10.0]
+        assert dents.grade_for(7) == 10
+        assert dents.grade_for(10) == GRADE_OVER_MAX
+
+    def test_add_many(self):
+        """Test add_many methods of grades classes."""
+        pytest.importorskip("numpy")
+        from pipeline_csv.csvfile.statistics.defects import Depth, DistDanger, SingleDist
+
+        defects = [defect for tube in self.csv_file.get_tubes() for defect in tube.defects]
+        objects = [
+          lambda: Depth(grades=[1, 5, 10]),
+          lambda: Depth(grades=[10, 1, 5, 5]),
+          lambda: DistDanger(self.csv_file.total_length, 7),
+          SingleDist,
+        ]
+        for make_object in objects:
+            one, many = make_object(), make_object()
+            for defect in defects:
+                one.add_data(defect)
+            many.add_many(defects[:10])
+            many.add_many(defects[10:])
+            many.add_many([])
+            assert one.number == many.number == len(defects)
+            assert one.data == many.data
+            assert getattr(one, 'tubes', None) == getattr(many, 'tubes', None)
+
+    def test_dist_stacked_add_array(self):
+        """Test DistStacked.add_array and add_many methods."""
+        pytest.importorskip("numpy")
+        from pipeline_csv.csvfile.statistics.defects import DistWallside, DistSingle
+
+        defects = [defect for tube in self.csv_file.get_tubes() for defect in tube.defects]
+        length = self.csv_file.total_length
+        for make_object in [
+          lambda: DistWallside(0, length, 40),
+          lambda: DistWallside(length / 4, length / 2, 7),
+          lambda: DistSingle(length / 4, length / 2, 40),
+        ]:
+            one, many = make_object(), make_object()
+            for defect in defects:
+                one.add_data(defect)
+            many.add_many(defects[:10])
+            many.add_many(defects[10:])
+            many.add_many([])
+
+            assert str(one) == str(many)
+            assert one.number == many.number
+            assert [list(one.data[i].data.items()) for i in one.nodes] == [
+              list(many.data[i].data.items()) for i in many.nodes
+            ]
+            assert one.before_start == many.before_start
+            assert one.after_end == many.after_end
+
+        stacked = DistWallside(100, 100, 10)
+        stacked.add_array([50, 100, 105, 110, 199.5, 200, 201], [1, 1, 2, 1, 1, 2, 1])
+        assert stacked.number == 5
+        assert stacked.before_start == [50]
+        assert stacked.after_end == [201]
+        assert stacked.data[100].data == {1: 1, 2: 1}
+        assert stacked.data[110].data == {1: 1}
+        assert stacked.data[190].data == {1: 1, 2: 1}
+
+    def test_malformed(self):
+        """Check errors for malformed numeric defect fields."""
+        from pipeline_csv.orientation import Orientation
+        from pipeline_csv.csvfile.statistics.defects import Totals, DistWallside
+
+        defect = self.make_defect(11, 10, Orientation(8, 0), Orientation(9, 0), None, 11)
+        totals = Totals(0, 1000, [])
+        wallside = DistWallside(0, 1000, 10)
+        totals.add_defect(defect, self.tube, [])
+        assert wallside.get_val(defect) == defect.row.type_def_num
+
+        defect.row.type_def = 'x'
+        with pytest.raises(ValueError):
+            totals.add_defect(defect, self.tube, [])
+        with pytest.raises(ValueError):
+            wallside.get_val(defect)
+
+        defect.row.type_def = '1'
+        defect.row.object_code = 'x'
+        with pytest.raises(ValueError):
+            totals.add_defect(defect, self.tube, [])
@@ -33,3 +33,61 @@ class TestInit(TestStatistics):
         count.add_item(0, self.tube)
         assert count.tubes_all() == 1
         assert count.tubes_with(0) == 1
+
+        other = PropertyCounter()
+        self.tube.auto_number = '2'
+        other.add_item(1, self.tube)
+        other.add_item(0, self.tube)
+        count.merge(other)
+        assert count.tubes_all() == 2
+        assert count.tubes_with(0) == 2
+        assert count.tubes_with(1) == 1
+
+    @staticmethod
+    def test_tube_set():
+        """Check TubeSet class."""
+        from pipeline_csv.csvfile.statistics import TubeSet
+
+        tubes = TubeSet([3, 20, 3, 0])
+        assert len(tubes) == 3
+        assert list(tubes) == [0, 3, 20]
+        assert 20 in tubes
+        assert 4 not in tubes
+        assert 1000 not in tubes
+        assert tubes == TubeSet([20, 0, 3])
+        assert tubes != TubeSet([20, 0])
+        assert tubes != {0: True, 3: True, 20: True}
+        assert 'TubeSet([0, 3, 20])' in repr(tubes)
+
+        assert tubes.update(TubeSet([1, 3]), TubeSet(), TubeSet([100])) is tubes
+        assert list(tubes) == [0, 1, 3, 20, 100]
+        assert len(tubes) == 5
+        assert tubes == TubeSet([0, 1, 3, 20, 100])
+        assert len(TubeSet().update()) == 0
+
+    def test_tube_set_names(self):
+        """Check TubeSet with tubes without ordinal numbers."""
+        from pipeline_csv.csvfile import Stream
+        from pipeline_csv.csvfile.statistics import PropertyCounter, TubeSet, tube_ordinal
+        from pipeline_csv.oegiv import File
+
+        last = File.from_file(self.fixture('DefTable.csv'), 1400).last_pipe(Stream(diameter=1400))
+        assert tube_ordinal(last) is None
+        assert tube_ordinal(self.tube) == 1
+
+        count = PropertyCounter()
+        count.add_item(1, last)
+        count.add_item(1, last)
+        count.add_item(1, self.tube)
+        assert count.tubes_with(1) == 2
+        assert list(count.tubes[1]) == [1, last.number]
+
+        self.tube.auto_number = 'xxx'
+        other = PropertyCounter()
+        other.add_item(1, self.tube)
+        other.add_item(2, self.tube)
+        count.merge(other)
+        assert count.tubes_with(1) == 3
+        assert count.tubes_all() == 3
+        assert count.tubes[2] == other.tubes[2]
+        assert count.tubes[2] != TubeSet()
@@ -14,3 +14,19 @@ class TestPipes(TestStatistics):
 
         counter = CounterLength(100)
         assert "len: 100" in str(counter)
+
+    @staticmethod
+    def test_tube_property():
+        """Check TubeProperty merge."""
+        from pipeline_csv.csvfile.statistics.pipes import TubeProperty
+
+        prop, other = TubeProperty(), TubeProperty()
+        prop.add_data(70, 100)
+        other.add_data(70, 50)
+        other.add_data(90, 10)
+
+        assert prop.merge(other) is prop
+        assert (prop.number, prop.length) == (3, 160)
+        assert (prop.data[70].number, prop.data[70].length) == (2, 150)
+        assert (prop.data[90].number, prop.data[90].length) == (1, 10)
+        assert prop.data[90] is not other.data[90]
@@ -2,6 +2,7 @@
 
 make test T=test_csv/test_statistics/test_totals.py
 """
+from pipeline_csv.csvfile.statistics import defects as stat_defects
 from . import TestStatistics
 
 
@@ -18,6 +19,53 @@ def check_tube_property(prop, val, num, length):
     assert prop.data[val].length == length
 
 
+def defect_rows(defects):
+    """Return list of rows values for given defects."""
+    return [i.row.values() for i in defects]
+
+
+def totals_key(totals):
+    """Return tuple of statistics values for compare Totals with custom defects statistics."""
+    defects = totals.defects
+    return (
+      str(totals), totals.start, totals.length, [i.values() for i in totals.markers],
+      totals.liners.tubes, totals.liners.tubes_all(),
+      defects.base_types.tubes, defects.base_angle_anomalies.hours,
+      defects.depth.data, defects.depth.tubes, defects.depth.max_percent,
+      defects.dents.data, defects.dents.tubes, defects.danger_valve.data,
+      {key: defect_rows(val) for key, val in defects.distribution.data.items()}, defects.distribution_bars.data,
+      str(defects.part_dist_loss_wallside),
+      defect_rows(defects.part_dist_loss_wallside.before_start),
+      defect_rows(defects.part_dist_loss_wallside.after_end),
+    )
+
+
+class PartsDefectsTotals(stat_defects.Totals):
+    """Custom defect totals class for merge tests."""
+
+    def __init__(self, start, length, markers, ext_params=None):
+        """Make new defects total object with custom properties."""
+        super().__init__(start, length, markers, ext_params=ext_params)
+        self.depth = stat_defects.Depth(grades=[10])
+        self.dents = stat_defects.Dents(grades=[5, 10])
+        self.danger_valve = stat_defects.DangerValve(markers)
+        self.distribution = stat_defects.SingleDist()
+        self.distribution_bars = stat_defects.DistDanger(length)
+        self.part_dist_loss_wallside = stat_defects.DistWallside(start + length / 4, length / 2, 40)
+
+    def add_defect(self, defect, tube, warns):
+        """Add defect to custom statistics."""
+        super().add_defect(defect, tube, warns)
+        self.danger_valve.add_data(defect)
+        self.distribution.add_data(defect)
+        self.distribution_bars.add_data(defect)
+        if defect.is_metal_loss:
+            self.depth.add_data(defect)
+            self.part_dist_loss_wallside.add_data(defect)
+        if defect.is_dent:
+            self.dents.add_data(defect)
+
+
 class TestTotals(TestStatistics):
     """File totals.py."""
 
@@ -154,8 +202,8 @@ class TestTotals(TestStatistics):
         assert totals.defects.dents.data[5] == 1
         assert totals.defects.dents.data[10] == 1
         assert totals.defects.dents.data[GRADE_OVER_MAX] == 0
-        assert list(totals.defects.dents.tubes[5].keys()) == ['W6332']
-        assert list(totals.defects.dents.tubes[10].keys()) == ['W14736']
+        assert list(totals.defects.dents.tubes[5]) == [7]  # W6332
+        assert list(totals.defects.dents.tubes[10]) == [15]  # W14736
 
         assert totals.defects.distribution.number == totals.defects.number
         assert len(totals.defects.danger_valve.grades) == 1
@@ -167,3 +215,103 @@ class TestTotals(TestStatistics):
         assert len(totals.defects.part_dist_loss_wallside.before_start) > 0
         # print('---')
         # [print(i) for i in totals.markers]
+
+    def test_fill_single_pass(self):
+        """Check Totals.fill method in single and two pass modes."""
+        from pipeline_csv.oegiv import File
+        from pipeline_csv.csvfile.statistics.totals import Totals
+        from pipeline_csv.csvfile.statistics.defects import Totals as DefectsTotalsBase, DangerValve
+
+        class DefectsTotals(DefectsTotalsBase):
+            """Defect totals with valves grades."""
+
+            def __init__(self, start, length, markers, ext_params=None):
+                """Make new defects total object with valves grades."""
+                super().__init__(start, length, markers, ext_params=ext_params)
+                self.danger_valve = DangerValve(markers)
+
+            def add_defect(self, defect, tube, warns):
+                """Add defect to valves grades."""
+                super().add_defect(defect, tube, warns)
+                self.danger_valve.add_data(defect)
+
+        csv_file = File.from_file(self.fixture('statistics.csv'), 1400)
+        single, double = Totals(defects_class=DefectsTotals), Totals(defects_class=DefectsTotals)
+        single.fill(csv_file, [])
+        double.fill(csv_file, [], single_pass=False)
+
+        assert str(single) == str(double)
+        assert single.defects.number == double.defects.number == 75
+        assert single.defects.base_angle_anomalies.hours == double.defects.base_angle_anomalies.hours
+        assert single.defects.danger_valve.data == double.defects.danger_valve.data
+        assert sum(single.defects.danger_valve.data.values()) == 75
+
+    def test_merge(self):
+        """Check Totals.merge method for statistics of csv file parts."""
+        from pipeline_csv.oegiv import File
+        from pipeline_csv.csvfile.statistics.totals import Totals
+
+        def make_part(tubes):
+            """Return statistics for given tubes with defects statistics for whole file."""
+            part = Totals(defects_class=PartsDefectsTotals)
+            part.init_fill()
+            part.start = tubes[0].dist
+            part.length = tubes[-1].dist + int(tubes[-1].length) - part.start
+            part.defects = PartsDefectsTotals(full.start, full.length, full.markers)
+            for tube in tubes:
+                part.add_data(tube)
+                part.markers.extend(i for i in tube.lineobjects if i.marker == i.get_bool(True))
+                part.defects.add_data(tube, [])
+            return part
+
+        csv_file = File.from_file(self.fixture('statistics.csv'), 1400)
+        full = Totals(defects_class=PartsDefectsTotals)
+        full.fill(csv_file, [])
+        tubes = list(csv_file.get_tubes())
+        bounds = [(0, 10), (10, 11), (11, 30), (30, len(tubes))]
+
+        merged = Totals(defects_class=PartsDefectsTotals)
+        for start, stop in bounds:
+            merged.merge(make_part(tubes[start:stop]))
+        assert totals_key(merged) == totals_key(full)
+
+        parts = [make_part(tubes[start:stop]) for start, stop in bounds]
+        merged = parts[0].merge(parts[1].merge(parts[2]).merge(parts[3]))
+        assert totals_key(merged) == totals_key(full)
+        assert merged.merge(Totals()) is merged
+        assert totals_key(merged) == totals_key(full)
+
+    def test_fill_parallel(self):
+        """Check Totals.fill_parallel method."""
+        from pipeline_csv.oegiv import File, Row
+        from pipeline_csv.csvfile.statistics.totals import Totals
+
+        csv_file = File.from_file(self.fixture('statistics.csv'), 1400)
+        csv_file.data[53].depth_max = ''  # zero depth dent warning
+        full = Totals(defects_class=PartsDefectsTotals)
+        full_warns = []
+        full.fill(csv_file, full_warns)
+        assert 'Zero depth dent' in full_warns[0]
+
+        for workers in [1, 2, 3, 100]:
+            totals = Totals(defects_class=PartsDefectsTotals)
+            warns = []
+            totals.fill_parallel(csv_file, warns, workers)
+            assert totals_key(totals) == totals_key(full)
+            assert warns == full_warns
+
+        csv_file = File(1400)
+        csv_file.data += [Row.as_thick(0, 105)] + [Row.as_weld(i) for i in [10, 1000, 2000, 3000, 4000, 5000]]
+        full.fill(csv_file, None)
+        assert full.pipes.thick.data[None].number == 5
+        totals.fill_parallel(csv_file, None, 3)
+        assert str(totals) == str(full)
+        assert [csv_file.tube_at(i).thick for i in [10, 2500, 4999]] == [None, None, None]
+
+        csv_file = File.from_file(self.fixture('statistics.csv'), 1400)
+        shards = totals.shards(csv_file, 3)
+        assert [i[2] for i in shards] == [1, 14, 28]
+        assert shards[0][0] == 0
+        assert shards[-1][1] == len(csv_file.data)
+        welds = csv_file.sorted_index().welds
+        assert [(i[0], i[1]) for i in shards[1:]] == [(welds[13], welds[27] + 1), (welds[27], len(csv_file.data))]
@@ -2,6 +2,7 @@
 
 make test T=test_orientation.py
 """
+import pytest
 from . import TestIV
 
 
@@ -122,3 +123,86 @@ class TestOrientation(TestIV):
 
         assert Orientation.from_minutes(60).as_hour_float == 1.0
         assert Orientation.from_minutes(90).as_hour_float == 1.5
+
+    def test_shared(self):
+        """Check shared immutable orientations."""
+        import pickle
+        from pipeline_csv.orientation import Orientation, Error, SHARED, CSV_PARSE, add180
+
+        assert len(SHARED) == 13 * 60
+        assert len(CSV_PARSE) >= 13 * 60
+        assert Orientation.from_csv('1,10') is Orientation.from_minutes(70)
+        assert Orientation.from_csv('1,5') is Orientation.from_csv('1,05')
+        assert Orientation.from_csv('12,05').hours == 12
+        assert Orientation.from_csv(' 1,05') is Orientation.from_csv('1,05')
+        assert add180(Orientation(3, 0)) is Orientation.from_csv('9,00')
+        assert pickle.loads(pickle.dumps(Orientation.from_minutes(70))) is Orientation.from_minutes(70)
+
+        ornt = Orientation.from_minutes(70)
+        with self.assertRaises(Error) as context:
+            ornt.add_minutes(10)
+        assert 'Shared orientation 1,10 can not be changed' in str(context.exception)
+
+        ornt = ornt.copy()
+        assert ornt.add_minutes(10) == 80
+        assert str(ornt) == '1,20'
+        assert Orientation.from_minutes(70).as_minutes == 70
+
+        ornt = pickle.loads(pickle.dumps(ornt))
+        assert ornt.add_minutes(10) == 90
+
+    def test_arrays(self):
+        """Check functions for arrays of minutes."""
+        np = pytest.importorskip("numpy")
+        from pipeline_csv import orientation
+        from pipeline_csv.csvfile.statistics.defects import get_hour
+
+        start = np.arange(0, 720, 7).repeat(103)
+        end = np.tile(np.arange(0, 720, 7), 103)
+        point = (start * 3 + 11) % 720
+
+        expected = []
+        for minutes_start, minutes_end, minutes in zip(start.tolist(), end.tolist(), point.tolist()):
+            ornt1 = orientation.Orientation.from_minutes(minutes_start)
+            ornt2 = orientation.Orientation.from_minutes(minutes_end)
+            clockwise = ornt1.dist_to_int(ornt2)[0]
+            expected.append((
+              clockwise,
+              ornt1.dist_to(ornt2),
+              orientation.Orientation.from_minutes(minutes).is_inside(ornt1, ornt2),
+              (minutes_start + int(clockwise / 2)) % 720,
+            ))
+
+        assert list(zip(
+          orientation.clockwise_array(start, end).tolist(),
+          orientation.dist_array(start, end).tolist(),
+          orientation.inside_array(point, start, end).tolist(),
+          orientation.middle_array(start, end).tolist(),
+        )) == expected
+
+        assert orientation.hours_array(np.arange(720)).tolist() == [get_hour(i) for i in range(720)]
+
+    def test_hours_histogram(self):
+        """Check hours_histogram for defects of csv file."""
+        pytest.importorskip("numpy")
+        from pipeline_csv.orientation import hours_histogram
+        from pipeline_csv.oegiv import File
+        from pipeline_csv.csvfile.statistics.defects import Angles
+
+        csv_file = File.from_file(self.fixture('infotech.csv'), 1400)
+        angles = Angles()
+        for tube in csv_file.get_tubes():
+            for defect in tube.defects:
+                angles.add_data(defect)
+
+        table = csv_file.to_columns()
+        # Angles skip defects with zero start orientation
+        defects = table.is_defect & (table.orient_td > 0)
+        histogram = hours_histogram(table.orient_td[defects], table.orient_bd[defects])
+        assert histogram.tolist() == [angles.hours[i] for i in range(12)]
+        assert sum(histogram) > 0
+
+        assert hours_histogram([700, -1, 30]).tolist() == [2] + [0] * 11
+        assert hours_histogram([700, -1, 31]).tolist() == [1, 1] + [0] * 10
+        assert hours_histogram([120], [-1]).tolist() == [0, 0, 1] + [0] * 9
+        assert hours_histogram([500], [120]).tolist() == [1, 1, 1] + [0] * 5 + [1, 1, 1, 1]